@@ -0,0 +1,140 @@
+# benchmarks/bench_adaptadores.py
+# Mide el parseo (Python puro) de cada adaptador de sitio contra fixtures grabados y verifica el resultado.
+#   python benchmarks/bench_adaptadores.py                       # todos los sitios con fixtures
+#   python benchmarks/bench_adaptadores.py --sitio falabella --repeticiones 20
+#
+# fixtures/<sitio>/listado.jsonl : {"crudo": {...pod leído del navegador...}, "esperado": {marca, tamaño, precio_valor}}
+#                                  'crudo' es texto real del sitio (grabar con --grabar-pods) y 'esperado' se
+#                                  etiqueta a mano leyendo el pod, nunca con los parsers. "nota" marca una
+#                                  diferencia conocida del parser (se informa sin fallar). precio_valor solo se
+#                                  etiqueta si el caso trae el precio_crudo leído por el selector de precio.
+# fixtures/<sitio>/api/          : respuestas de la API de ficha + casos.jsonl con lo que mostró la ficha renderizada
+#                                  (grabar con --api-fixtures fixtures/<sitio>/api --grabar-api)
+import argparse
+import json
+import os.path as osp
+import statistics
+import sys
+import time
+
+RAIZ = osp.dirname(osp.dirname(osp.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from scraper.sitios import SiteAdapter, get_sitio, sitios_disponibles  # noqa: E402
+
+FIXTURES_DIR = osp.join(RAIZ, "fixtures")
+
+
+def _medir(fn, entradas, repeticiones: int) -> float:
+    """Mediana (µs por entrada) de aplicar fn a todas las entradas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for e in entradas:
+            fn(e)
+        tiempos.append((time.perf_counter() - t0) / max(len(entradas), 1) * 1e6)
+    return statistics.median(tiempos)
+
+
+def bench_sitio(sitio: SiteAdapter, repeticiones: int) -> bool:
+    base = osp.join(FIXTURES_DIR, sitio.nombre)
+    ok = True
+    print(f"🏬 {sitio.nombre}")
+
+    ruta_listado = osp.join(base, "listado.jsonl")
+    if osp.exists(ruta_listado):
+        with open(ruta_listado, "r", encoding="utf-8") as f:
+            casos = [json.loads(x) for x in f if x.strip()]
+        crudos = [c["crudo"] for c in casos]
+        difs, conocidas, resueltas = 0, 0, []
+        for c in casos:
+            item = sitio.parsear_item(c["crudo"])
+            obtenido = {} if item is None else {
+                "marca": item["marca"], "tamaño": item["tamaño"], "precio_valor": item["precio"][1]
+            }
+            distinto = any(obtenido.get(k) != v for k, v in c.get("esperado", {}).items())
+            if distinto and c.get("nota"):
+                conocidas += 1
+            elif distinto:
+                difs += 1
+                if difs <= 5:
+                    print(f"   ≠ {c['crudo'].get('titulo')!r}: esperado {c['esperado']} obtenido {obtenido}")
+            elif c.get("nota"):
+                resueltas.append(c["crudo"].get("titulo"))
+        sin_etiquetar = sum(1 for c in casos if not c.get("esperado"))
+        con_precio = sum(1 for c in casos
+                         if c["crudo"].get("precio_crudo") and "precio_valor" in c.get("esperado", {}))
+        us = _medir(sitio.parsear_item, crudos, repeticiones)
+        print(f"   parsear_item        {len(casos):>6} pods   {us:8.2f} µs/pod   diferencias: {difs}"
+              f" (conocidas: {conocidas}, sin etiquetar: {sin_etiquetar})")
+        if not con_precio:
+            print("   ⚠️ Ningún caso con precio_crudo grabado: limpiar_precio sin verificar (usar --grabar-pods)")
+        for titulo in resueltas[:5]:
+            print(f"   ✔ ya coincide (quitar 'nota'): {titulo!r}")
+        ok = ok and difs == 0
+        links = [c.get("link") or "" for c in crudos]
+        us = _medir(sitio.extraer_product_id, links, repeticiones)
+        print(f"   extraer_product_id  {len(links):>6} links  {us:8.2f} µs/link")
+    else:
+        print(f"   (sin {ruta_listado})")
+
+    ok = bench_api(sitio, osp.join(base, "api"), repeticiones) and ok
+    return ok
+
+
+def bench_api(sitio: SiteAdapter, carpeta: str, repeticiones: int) -> bool:
+    """Verifica parsear_specs_api/parsear_rating_api contra lo que mostró la ficha (casos.jsonl) y los mide."""
+    ruta_casos = osp.join(carpeta, "casos.jsonl")
+    if not osp.exists(ruta_casos):
+        if sitio.url_api_specs("0") or sitio.url_api_rating("0"):
+            print(f"   ❌ sin respuestas grabadas de la API ({ruta_casos}): endpoints y parseo sin verificar")
+            return False
+        return True
+
+    def _cargar(nombre):
+        with open(osp.join(carpeta, nombre), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    with open(ruta_casos, "r", encoding="utf-8") as f:
+        casos = [json.loads(x) for x in f if x.strip()]
+    specs, ratings = [], []
+    difs = 0
+    for c in casos:
+        obtenido = {}
+        if "specs" in c:
+            specs.append(_cargar(c["specs"]))
+            obtenido["detalles_adicionales"] = sitio.parsear_specs_api(specs[-1])
+        if "rating" in c:
+            ratings.append(_cargar(c["rating"]))
+            obtenido["calificacion"] = sitio.parsear_rating_api(ratings[-1])
+        for k, v in c["esperado"].items():
+            if obtenido.get(k) != v:
+                difs += 1
+                if difs <= 5:
+                    print(f"   ≠ {c['link']} [{k}]: ficha {v!r}\n     API   {obtenido.get(k)!r}")
+    if specs:
+        us = _medir(sitio.parsear_specs_api, specs, repeticiones)
+        print(f"   parsear_specs_api   {len(specs):>6} resp.  {us:8.2f} µs/resp")
+    if ratings:
+        us = _medir(sitio.parsear_rating_api, ratings, repeticiones)
+        print(f"   parsear_rating_api  {len(ratings):>6} resp.  {us:8.2f} µs/resp")
+    print(f"   API vs ficha        {len(casos):>6} casos  diferencias: {difs}")
+    return difs == 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark de parseo por adaptador de sitio (fixtures grabados).")
+    ap.add_argument("--sitio", choices=sitios_disponibles(), default=None, help="Solo este sitio (por defecto todos).")
+    ap.add_argument("--repeticiones", type=int, default=10)
+    args = ap.parse_args()
+
+    nombres = [args.sitio] if args.sitio else sitios_disponibles()
+    ok = all([bench_sitio(get_sitio(n), args.repeticiones) for n in nombres])
+    if not ok:
+        print("❌ El parseo no coincide con los fixtures (o faltan respuestas grabadas).")
+        sys.exit(1)
+    print("✅ Parseo consistente con los fixtures.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_startup.py
+# Mide el tiempo de arranque de la CLI (sin abrir navegador) y verifica que no se cargue Selenium.
+#   python benchmarks/bench_startup.py --repeticiones 10
+import argparse
+import os
+import os.path as osp
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = osp.dirname(osp.dirname(osp.abspath(__file__)))
+
+CASOS = [
+    ("import scraper.cli", [sys.executable, "-c", "import scraper.cli"]),
+    ("--help", [sys.executable, "scrape_falabella_all.py", "--help"]),
+    ("stats --help", [sys.executable, "scrape_falabella_all.py", "stats", "--help"]),
+]
+
+# Módulos que no deben arrastrar Selenium (ni requests) al importarse
+VERIFICAR_LIVIANOS = (
+    "import sys, scraper.cli, scraper.stats, scraper.salidas, scraper.snapshots, scraper.historial, scraper.selectores\n"
+    "pesados = [m for m in ('selenium', 'webdriver_manager', 'requests') if m in sys.modules]\n"
+    "print(','.join(pesados))"
+)
+
+
+def medir(cmd, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tiempos)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark de arranque de la CLI.")
+    ap.add_argument("--repeticiones", type=int, default=10)
+    args = ap.parse_args()
+
+    base = medir([sys.executable, "-c", "pass"], args.repeticiones)
+    print(f"{'intérprete vacío':<20} {base:8.1f} ms")
+    for nombre, cmd in CASOS:
+        ms = medir(cmd, args.repeticiones)
+        print(f"{nombre:<20} {ms:8.1f} ms  (+{ms - base:.1f} ms sobre el intérprete)")
+
+    res = subprocess.run([sys.executable, "-c", VERIFICAR_LIVIANOS], cwd=RAIZ,
+                         capture_output=True, text=True, env=dict(os.environ), check=True)
+    pesados = res.stdout.strip()
+    if pesados:
+        print(f"❌ Módulos pesados cargados sin necesidad: {pesados}")
+        sys.exit(1)
+    print("✅ La CLI y los módulos livianos no importan Selenium/requests.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# scraper/__init__.py
+# Paquete del scraper de Falabella. Los módulos livianos (config, parsers, categorias,
+# salidas, stats, snapshots, historial, selectores) no importan Selenium; navegador,
+# ejecucion y replay sí, y solo se cargan cuando el modo elegido navega.
@@ -0,0 +1,40 @@
+# scraper/categorias.py
+# Categorías del sitio activo (nombre -> URL) y resolución por nombre.
+from typing import Dict, List, Optional, Tuple
+
+from scraper.sitios import get_sitio
+
+
+def categorias_sitio() -> Dict[str, str]:
+    """Categorías conocidas del sitio activo (clave -> URL del listado)."""
+    return get_sitio().categorias
+
+
+def resolver_categoria_por_nombre(nombre: str) -> Tuple[Optional[str], Optional[str]]:
+    if not nombre:
+        return None, None
+
+    target = nombre.strip().lower()
+    if not target:
+        return None, None
+
+    for k, url in categorias_sitio().items():
+        if k.strip().lower() == target:
+            return k, url
+
+    candidatos: List[Tuple[str, str]] = []
+    for k, url in categorias_sitio().items():
+        kl = k.strip().lower()
+        if target in kl or kl in target:
+            candidatos.append((k, url))
+
+    if candidatos:
+        candidatos.sort(key=lambda kv: len(kv[0]))
+        return candidatos[0]
+
+    return None, None
+
+
+def url_pagina(url_categoria: str, pagina: int) -> str:
+    """Agrega/reemplaza ?page=N en la URL del listado (página 1 = URL original)."""
+    return get_sitio().url_pagina(url_categoria, pagina)
@@ -0,0 +1,226 @@
+# scraper/cli.py
+# Punto de entrada de línea de comandos. Solo importa Selenium cuando el modo elegido navega.
+import argparse
+import sys
+from typing import List, Optional
+
+from scraper import config
+from scraper.categorias import categorias_sitio, resolver_categoria_por_nombre
+from scraper.config import LOGGER
+from scraper.sitios import sitios_disponibles
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    config.configurar_logging()
+
+    # Subcomando de consulta (no abre navegador)
+    if argv and argv[0] == "stats":
+        from scraper.stats import ejecutar_stats
+        ejecutar_stats(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Scraper de retailers (Falabella por defecto; incremental + modo rápido).",
+        epilog="Consultas sobre las salidas: scrape_falabella_all.py stats --help"
+    )
+    parser.add_argument(
+        "--sitio",
+        choices=sitios_disponibles(),
+        default=config.SITIO_POR_DEFECTO,
+        help="Adaptador de sitio (scraper/sitios). Los sitios distintos al principal escriben en data/<sitio>/."
+    )
+    parser.add_argument(
+        "--max-categories",
+        type=int,
+        default=None,
+        help="Limitar cantidad de categorías cuando se scrapean todas (None = todas). Ej: --max-categories 5"
+    )
+    grp = parser.add_mutually_exclusive_group()
+    grp.add_argument(
+        "--one-page",
+        dest="one_page",
+        action="store_true",
+        help="Limitar a 1 página por categoría (modo rápido)"
+    )
+    grp.add_argument(
+        "--multi-page",
+        dest="one_page",
+        action="store_false",
+        help="Permitir múltiples páginas por categoría"
+    )
+    parser.set_defaults(one_page=None)
+
+    parser.add_argument(
+        "--category",
+        type=str,
+        default=None,
+        help="Nombre de la categoría a scrapear (según las categorías del sitio). Si se omite, se scrapean todas."
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=None,
+        help="Cantidad máxima de páginas a scrapear por categoría. Ej: --pages 3"
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Modo rápido: no abre todas las fichas (solo si falta rating) y reduce scroll/esperas."
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Solo re-scrapear categorías cuya primera página (IDs + precios) cambió desde la última corrida."
+    )
+    parser.add_argument(
+        "--budget-pages",
+        type=int,
+        default=None,
+        help="Refresco programado: recarga solo las N páginas de listado más vencidas según la volatilidad de precios."
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        default=None,
+        help="Tiempo máximo (s) por página antes de matar y reiniciar el navegador. Por defecto 300."
+    )
+    parser.add_argument(
+        "--selectores",
+        type=str,
+        default=None,
+        help="Archivo JSON con el perfil de selectores (por defecto selectores.json junto al script)."
+    )
+    parser.add_argument(
+        "--render",
+        choices=["completo", "ligero", "minimo", "auto"],
+        default=None,
+        help="Perfil de render del navegador. 'auto' calibra por categoría y elige el más barato con listado completo."
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=None,
+        help="Presupuesto de memoria (MB) del navegador por página; si se supera se recicla el navegador."
+    )
+    parser.add_argument(
+        "--max-cpu-s",
+        type=float,
+        default=None,
+        help="Presupuesto de CPU (s) del navegador por página; si se supera se recicla el navegador."
+    )
+    parser.add_argument(
+        "--snapshots",
+        nargs="?",
+        const="",
+        default=None,
+        help="Guardar listados/fichas (MHTML) y las respuestas de la API (gzip, deduplicado). "
+             "Por defecto en la carpeta del sitio: data/_snapshots o data/<sitio>/_snapshots."
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Reprocesar desde los snapshots (sin red) en paralelo. Respeta --category."
+    )
+    parser.add_argument(
+        "--api-detalles",
+        action="store_true",
+        help="Pedir detalles/rating a la API interna de la ficha (sin verificar contra respuestas grabadas; "
+             "la ficha en el navegador queda como respaldo)."
+    )
+    parser.add_argument(
+        "--no-api-detalles",
+        action="store_true",
+        help="No usar la API interna de la ficha; abrir cada ficha en el navegador (por defecto)."
+    )
+    parser.add_argument(
+        "--api-fixtures",
+        type=str,
+        default=None,
+        help="Carpeta con respuestas grabadas de la API de detalles (modo offline). Ej: --api-fixtures fixtures/falabella/api"
+    )
+    parser.add_argument(
+        "--grabar-api",
+        action="store_true",
+        help="Junto con --api-fixtures: guarda las respuestas reales de la API en esa carpeta."
+    )
+    parser.add_argument(
+        "--grabar-pods",
+        nargs="?",
+        const="",
+        default=None,
+        help="Grabar lo leído de cada pod del listado (para fixtures del benchmark). "
+             "Por defecto en fixtures/<sitio>/pods_grabados.jsonl."
+    )
+
+    args = parser.parse_args(argv)
+    config.usar_sitio(args.sitio)
+
+    # Overrides de configuración global según CLI
+    if args.max_categories is not None:
+        config.MAX_CATEGORIES = args.max_categories
+    if args.one_page is not None:
+        config.LIMIT_ONE_PAGE_PER_CATEGORY = bool(args.one_page)
+    if args.fast:
+        config.FAST_MODE = True
+        LOGGER.info("⚡ Modo rápido activado (--fast)")
+    if args.changed_only:
+        config.CHANGED_ONLY = True
+    if args.selectores:
+        config.SELECTORES_JSON = args.selectores
+    # Los valores por defecto dependen del sitio: se resuelven después de usar_sitio()
+    if args.snapshots is not None:
+        config.SNAPSHOT_DIR = args.snapshots or config.SNAPSHOT_DIR_POR_DEFECTO
+    if args.grabar_pods is not None:
+        config.GRABAR_PODS = args.grabar_pods or config.GRABAR_PODS_POR_DEFECTO
+    if args.replay and not config.SNAPSHOT_DIR:
+        config.SNAPSHOT_DIR = config.SNAPSHOT_DIR_POR_DEFECTO
+    if args.render:
+        config.RENDER_PROFILE = args.render
+    if args.max_rss_mb:
+        config.MAX_RSS_MB_POR_PAGINA = args.max_rss_mb
+    if args.max_cpu_s:
+        config.MAX_CPU_S_POR_PAGINA = args.max_cpu_s
+    if args.watchdog:
+        config.WATCHDOG_PAGINA_S = args.watchdog
+    if args.api_detalles or args.api_fixtures:
+        config.USE_DETAIL_API = True
+    if args.no_api_detalles:
+        config.USE_DETAIL_API = False
+    if args.api_fixtures:
+        config.DETAIL_API_FIXTURES = args.api_fixtures
+        config.DETAIL_API_RECORD = bool(args.grabar_api)
+
+    config.asegurar_out_dir()
+
+    # Reprocesamiento desde snapshots (sin navegar el sitio)
+    if args.replay:
+        from scraper.replay import ejecutar_replay
+        claves = None
+        if args.category:
+            nombre_match, _ = resolver_categoria_por_nombre(args.category)
+            claves = [nombre_match or args.category]
+        ejecutar_replay(claves)
+    # Refresco programado por volatilidad (no recorre categorías completas)
+    elif args.budget_pages is not None:
+        from scraper.ejecucion import ejecutar_refresco_programado
+        ejecutar_refresco_programado(args.budget_pages)
+    # Si el usuario especifica una categoría
+    elif args.category:
+        nombre_match, url = resolver_categoria_por_nombre(args.category)
+        if not url:
+            disponibles = ", ".join(sorted(categorias_sitio().keys())) or "(vacío; agrega pares nombre->url en las categorías del adaptador)"
+            raise SystemExit(
+                f"❌ No se encontró la categoría '{args.category}' en el sitio '{config.SITIO}'.\n"
+                f"   Disponibles: {disponibles}"
+            )
+        from scraper.ejecucion import extraer_una_categoria
+        extraer_una_categoria(nombre_match, url, max_pages=args.pages)
+    else:
+        # Sin categoría específica -> scrapea todas las del sitio
+        from scraper.ejecucion import extraer_todas_categorias
+        extraer_todas_categorias(max_pages=args.pages)
+
+
+if __name__ == "__main__":
+    main()
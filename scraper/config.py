@@ -0,0 +1,126 @@
+# scraper/config.py
+# Configuración global (rutas, flags de CLI) y logging. Sin dependencias pesadas.
+import time
+import random
+import logging
+import os
+import os.path as osp
+from typing import Optional
+from datetime import datetime
+
+
+# =========================
+# CONFIG & LOGGING
+# =========================
+# Nada se crea ni se configura al importar: la CLI llama a configurar_logging() y asegurar_out_dir()
+# solo cuando hace falta (así 'stats' o '--help' arrancan sin efectos secundarios).
+OUT_DIR = osp.join(os.getcwd(), "data")
+
+LOGGER = logging.getLogger("falabella_all_scraper")
+
+# Sitio activo (adaptador en scraper/sitios). CLI: --sitio. El sitio por defecto escribe en data/;
+# los demás en data/<sitio>/ (ver usar_sitio)
+SITIO_POR_DEFECTO = "falabella"
+SITIO: str = SITIO_POR_DEFECTO
+
+# Archivos por defecto (fallback). Para scrapes por categoría se redefinen con set_run_outputs(...)
+OUTPUT_JSON = osp.join(OUT_DIR, "productos_all.json")
+OUTPUT_JSONL = osp.join(OUT_DIR, "productos_all.jsonl")
+
+# Limitar cantidad de categorías al ejecutar TODAS (None = todas)
+MAX_CATEGORIES: Optional[int] = None
+
+# Por defecto: permitir múltiples páginas por categoría
+LIMIT_ONE_PAGE_PER_CATEGORY: bool = False
+
+# Modo rápido global (se puede activar por CLI con --fast)
+FAST_MODE: bool = False
+
+# Detalles/rating desde la API interna de la ficha (CLI: --api-detalles). Desactivada por defecto
+# hasta que haya respuestas reales grabadas en fixtures/<sitio>/api/ que verifiquen endpoints y parseo
+USE_DETAIL_API: bool = False
+
+# Carpeta con respuestas grabadas de la API de detalles (None = red real). Ver DetalleFetcher.
+DETAIL_API_FIXTURES: Optional[str] = None
+DETAIL_API_RECORD: bool = False
+
+# Solo re-scrapear categorías cuya huella del listado cambió (se activa por CLI con --changed-only)
+CHANGED_ONLY: bool = False
+
+# Huellas (fingerprints) de la primera página de cada categoría, guardadas entre corridas
+FINGERPRINTS_JSON = osp.join(OUT_DIR, "_fingerprints.json")
+
+# Historial de precios por producto (alimenta el planificador de refrescos, ver --budget-pages)
+HISTORIAL_JSON = osp.join(OUT_DIR, "_historial_precios.json")
+
+# Watchdog por unidad de trabajo (segundos). Ver SupervisorDriver; se ajusta por CLI con --watchdog
+# WATCHDOG_PAGINA_S cubre la lectura del listado; cada ficha abierta en ventana (respaldo de la API)
+# extiende el plazo en WATCHDOG_POR_FICHA_S, así una página lenta pero que avanza no se mata
+WATCHDOG_PAGINA_S: float = 300.0
+WATCHDOG_POR_FICHA_S: float = 60.0
+WATCHDOG_NAVEGACION_S: float = 120.0
+# Fallos (timeouts/crashes) tolerados por categoría antes de abandonarla
+MAX_FALLOS_CATEGORIA: int = 3
+
+# Perfil de selectores (config editable sin tocar código; None = el del adaptador) y estadísticas de aciertos
+SELECTORES_JSON: Optional[str] = None
+SELECTORES_STATS_JSON = osp.join(OUT_DIR, "_selectores_stats.json")
+
+# Perfil de render del navegador: "completo", "ligero", "minimo" o "auto" (calibra por categoría). CLI: --render
+RENDER_PROFILE: str = "completo"
+# Presupuesto de RSS (MB) del árbol de procesos de Chrome por página; si se supera se recicla el navegador
+MAX_RSS_MB_POR_PAGINA: Optional[float] = None
+# Presupuesto de CPU (s) del navegador por página; si se supera se recicla. CLI: --max-cpu-s
+MAX_CPU_S_POR_PAGINA: Optional[float] = None
+# Perfil elegido por categoría en modo "auto" (se reutiliza entre corridas)
+PERFILES_RENDER_JSON = osp.join(OUT_DIR, "_perfiles_render.json")
+
+# Caché local de HTML/JSON crudo (None = desactivada). CLI: --snapshots [DIR]; --replay reprocesa desde ahí
+SNAPSHOT_DIR: Optional[str] = None
+SNAPSHOT_DIR_POR_DEFECTO = osp.join(OUT_DIR, "_snapshots")
+# Modo replay: sin red, sin pausas ni scroll; todo sale del snapshot
+REPLAY_MODE: bool = False
+# Corrida que se está reprocesando: las respuestas de API y fichas se buscan solo en ella
+REPLAY_CORRIDA: Optional[str] = None
+
+# Archivo donde se graba lo leído de cada pod (crudo + texto del pod) para etiquetarlo a mano y
+# sumarlo a fixtures/<sitio>/listado.jsonl (None = no grabar). CLI: --grabar-pods [ARCHIVO]
+GRABAR_PODS: Optional[str] = None
+GRABAR_PODS_POR_DEFECTO = osp.join(os.getcwd(), "fixtures", SITIO, "pods_grabados.jsonl")
+
+# Identificador de esta corrida (agrupa los snapshots de un mismo scrape)
+CORRIDA_ID = datetime.now().strftime("%Y%m%dT%H%M%S")
+
+
+def configurar_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
+
+def usar_sitio(nombre: str) -> None:
+    """Activa un sitio y separa sus salidas/estado (huellas, historial, snapshots...) en data/<sitio>/."""
+    global SITIO, OUT_DIR, OUTPUT_JSON, OUTPUT_JSONL, FINGERPRINTS_JSON, HISTORIAL_JSON
+    global SELECTORES_STATS_JSON, PERFILES_RENDER_JSON, SNAPSHOT_DIR_POR_DEFECTO, GRABAR_PODS_POR_DEFECTO
+    SITIO = nombre
+    base = osp.join(os.getcwd(), "data")
+    OUT_DIR = base if nombre == SITIO_POR_DEFECTO else osp.join(base, nombre)
+    OUTPUT_JSON = osp.join(OUT_DIR, "productos_all.json")
+    OUTPUT_JSONL = osp.join(OUT_DIR, "productos_all.jsonl")
+    FINGERPRINTS_JSON = osp.join(OUT_DIR, "_fingerprints.json")
+    HISTORIAL_JSON = osp.join(OUT_DIR, "_historial_precios.json")
+    SELECTORES_STATS_JSON = osp.join(OUT_DIR, "_selectores_stats.json")
+    PERFILES_RENDER_JSON = osp.join(OUT_DIR, "_perfiles_render.json")
+    SNAPSHOT_DIR_POR_DEFECTO = osp.join(OUT_DIR, "_snapshots")
+    GRABAR_PODS_POR_DEFECTO = osp.join(os.getcwd(), "fixtures", nombre, "pods_grabados.jsonl")
+
+
+def asegurar_out_dir() -> None:
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+
+def nap(a=0.4, b=1.0):
+    if REPLAY_MODE:
+        return
+    time.sleep(random.uniform(a, b))
@@ -0,0 +1,151 @@
+# scraper/detalles.py
+# Detalles y rating de ficha vía la API JSON interna (sesión HTTP con pool + concurrencia).
+import hashlib
+import json
+import os
+import os.path as osp
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper import config
+from scraper.config import LOGGER
+from scraper.sitios import SiteAdapter, get_sitio
+from scraper.snapshots import get_snapshots
+
+
+# =========================
+# DETALLES VÍA API INTERNA (sin renderizar la ficha)
+# =========================
+class DetalleFetcher:
+    """
+    Obtiene especificaciones y rating llamando a los endpoints JSON de la ficha,
+    con una sesión HTTP con pool de conexiones y consultas concurrentes.
+    Las URLs y el parseo de las respuestas los pone el adaptador del sitio (url_api_* / parsear_*_api).
+
+    Con 'fixtures_dir' las respuestas se leen de disco (un archivo <sha1(url)>.json por URL),
+    lo que permite verificar el parseo sin red. Con 'grabar=True' las respuestas reales
+    se guardan en esa misma carpeta, y registrar_caso anota en casos.jsonl lo que mostró la
+    ficha renderizada para ese producto (lo que benchmarks/bench_adaptadores.py exige al parseo).
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: float = 10.0,
+                 fixtures_dir: Optional[str] = None, grabar: bool = False,
+                 sitio: Optional[SiteAdapter] = None):
+        self.sitio = sitio or get_sitio()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.fixtures_dir = fixtures_dir
+        self.grabar = grabar
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=1)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                          "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+            "Accept": "application/json",
+        })
+        self.session.headers.update(self.sitio.cabeceras_http)
+
+    def _ruta_fixture(self, url: str) -> str:
+        return osp.join(self.fixtures_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    @property
+    def grabando(self) -> bool:
+        return bool(self.fixtures_dir and self.grabar)
+
+    def registrar_caso(self, link: str, api: Tuple[str, str], esperado: dict) -> None:
+        """
+        Guarda en casos.jsonl qué respuestas grabadas corresponden a 'link' y el texto/rating que
+        mostró su ficha renderizada ('esperado'); avisa si el parseo de la API no coincide.
+        """
+        product_id = self.sitio.extraer_product_id(link)
+        caso = {"link": link, "esperado": esperado}
+        if "detalles_adicionales" in esperado:
+            caso["specs"] = osp.basename(self._ruta_fixture(self.sitio.url_api_specs(product_id)))
+        if "calificacion" in esperado:
+            caso["rating"] = osp.basename(self._ruta_fixture(self.sitio.url_api_rating(product_id)))
+        with open(osp.join(self.fixtures_dir, "casos.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(caso, ensure_ascii=False) + "\n")
+        obtenido = dict(zip(("detalles_adicionales", "calificacion"), api))
+        difs = [k for k, v in esperado.items() if obtenido[k] != v]
+        if difs:
+            LOGGER.warning(f"⚠️ API y ficha no coinciden en {', '.join(difs)} para {product_id}")
+
+    def _get_json(self, url: str):
+        if self.fixtures_dir and not self.grabar:
+            with open(self._ruta_fixture(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        store = get_snapshots()
+        if config.REPLAY_MODE:
+            crudo = store.ultimo("api", url, corrida=config.REPLAY_CORRIDA) if store else None
+            if crudo is None:
+                raise FileNotFoundError(f"sin snapshot para {url}")
+            return json.loads(crudo)
+        resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        data = json.loads(resp.text)
+        if store is not None:
+            store.guardar("api", url, resp.text, corrida=config.CORRIDA_ID)
+        if self.grabando:
+            os.makedirs(self.fixtures_dir, exist_ok=True)
+            with open(self._ruta_fixture(url), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        return data
+
+    def obtener(self, link: str, con_specs: bool = True, con_rating: bool = True) -> Optional[Tuple[str, str]]:
+        """
+        Devuelve (detalles_adicionales, calificacion) o None si la API falló
+        (en ese caso el llamador usa la ficha renderizada como respaldo).
+        """
+        product_id = self.sitio.extraer_product_id(link)
+        if not product_id:
+            return None
+        url_specs = self.sitio.url_api_specs(product_id) if con_specs else None
+        url_rating = self.sitio.url_api_rating(product_id) if con_rating else None
+        if (con_specs and not url_specs) or (con_rating and not url_rating):
+            return None
+        detalles, calificacion = "", "N/A"
+        try:
+            if con_specs:
+                detalles = self.sitio.parsear_specs_api(self._get_json(url_specs))
+                if not detalles:
+                    return None
+            if con_rating:
+                calificacion = self.sitio.parsear_rating_api(self._get_json(url_rating))
+                if calificacion is None:
+                    return None
+        except Exception as e:
+            LOGGER.debug(f"API detalles falló para {product_id}: {e}")
+            return None
+        return detalles, calificacion
+
+    def obtener_lote(self, pedidos: List[Tuple[str, bool, bool]]) -> List[Optional[Tuple[str, str]]]:
+        """pedidos: lista de (link, con_specs, con_rating). Mantiene el orden de entrada."""
+        if not pedidos:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda p: self.obtener(*p), pedidos))
+
+    def close(self):
+        self.session.close()
+
+
+_DETALLE_FETCHER: Optional[DetalleFetcher] = None
+
+
+def get_detalle_fetcher() -> DetalleFetcher:
+    global _DETALLE_FETCHER
+    if _DETALLE_FETCHER is None:
+        _DETALLE_FETCHER = DetalleFetcher(fixtures_dir=config.DETAIL_API_FIXTURES, grabar=config.DETAIL_API_RECORD)
+    return _DETALLE_FETCHER
+
+
+def cerrar_detalle_fetcher() -> None:
+    global _DETALLE_FETCHER
+    if _DETALLE_FETCHER is not None:
+        _DETALLE_FETCHER.close()
+        _DETALLE_FETCHER = None
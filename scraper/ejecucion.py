@@ -0,0 +1,190 @@
+# scraper/ejecucion.py
+# Corridas con navegador: todas las categorías, una categoría y refresco programado.
+from typing import Dict, List, Optional
+
+from scraper import config
+from scraper import salidas
+from scraper.categorias import categorias_sitio, url_pagina
+from scraper.config import LOGGER
+from scraper.detalles import cerrar_detalle_fetcher
+from scraper.historial import PlanificadorRefresco, alcance_crawl, cargar_huellas, categoria_sin_cambios, registrar_huella
+from scraper.navegador import PERFILES_RENDER, SupervisorDriver, cargar_listado, extraer_categoria, extraer_productos_pagina, huella_listado, perfil_para_categoria
+from scraper.salidas import Producto, guardar_json, guardar_resumen, set_run_outputs
+from scraper.selectores import exportar_selectores
+from scraper.snapshots import marcar_crawl
+
+
+# =========================
+# REFRESCO PROGRAMADO (--budget-pages)
+# =========================
+def ejecutar_refresco_programado(presupuesto_paginas: int) -> None:
+    """
+    Recarga solo las páginas de listado más vencidas según el historial, hasta 'presupuesto_paginas'.
+    Los productos refrescados se acumulan en {clave}_refresh.jsonl (no se tocan los _formatted).
+    """
+    planificador = PlanificadorRefresco()
+    if not planificador.historial:
+        LOGGER.warning("Sin historial de precios todavía: ejecuta primero un scrape completo.")
+        return
+    plan = planificador.siguientes(presupuesto_paginas)
+    LOGGER.info(f"🗓️ Refresco programado: {len(plan)} páginas vencidas (presupuesto {presupuesto_paginas}).")
+    if not plan:
+        return
+
+    supervisor = SupervisorDriver(config.RENDER_PROFILE if config.RENDER_PROFILE in PERFILES_RENDER else "completo")
+    try:
+        for clave, pagina in plan:
+            productos: List[Producto] = []
+            refrescada = False
+            try:
+                categoria_nombre = supervisor.ejecutar(
+                    cargar_listado, url_pagina(categorias_sitio()[clave], pagina), timeout=config.WATCHDOG_NAVEGACION_S
+                ) or clave
+                set_run_outputs(clave, sufijo="refresh", reiniciar=False)
+                supervisor.ejecutar(
+                    extraer_productos_pagina,
+                    pagina_actual=pagina,
+                    categoria_actual=categoria_nombre,
+                    obtener_detalles=False,
+                    vistos_links=set(),
+                    destino=productos,
+                    timeout=config.WATCHDOG_PAGINA_S
+                )
+                LOGGER.info(f"[{clave}] Página {pagina} refrescada: {len(productos)} productos -> {salidas.RUN_JSONL}")
+                refrescada = True
+            except Exception as e:
+                LOGGER.warning(f"Error refrescando '{clave}' página {pagina}: {e}")
+            # Solo una página leída completa permite dar por visitados a los que ya no están en ella
+            if refrescada:
+                planificador.registrar_pagina(clave, pagina, productos)
+            else:
+                planificador.registrar(clave, productos)
+            planificador.guardar()
+            guardar_resumen()
+    finally:
+        supervisor.quit()
+        cerrar_detalle_fetcher()
+        exportar_selectores()
+
+
+def _tomar_huella(supervisor: SupervisorDriver, nombre: str, url: str):
+    """
+    Carga liviana de la primera página para --changed-only (decidir si se omite); si falla se sigue
+    sin ella. La huella que se registra la toma extraer_categoria sobre la página 1 que ya carga.
+    """
+    try:
+        return supervisor.ejecutar(huella_listado, url, timeout=config.WATCHDOG_NAVEGACION_S)
+    except Exception as e:
+        LOGGER.warning(f"[{nombre}] No se pudo tomar la huella del listado: {e}")
+        return None
+
+
+# =========================
+# EJECUCIÓN COMPLETA (todas las categorías del sitio)
+# =========================
+def extraer_todas_categorias(max_pages: Optional[int] = None):
+    """
+    Scrapea TODAS las categorías del sitio activo (SiteAdapter.categorias).
+    Crea un archivo por categoría {clave}_formatted.json / .jsonl
+    Con CHANGED_ONLY se omiten las categorías cuya primera página no cambió desde la última corrida.
+    """
+    supervisor = SupervisorDriver(config.RENDER_PROFILE if config.RENDER_PROFILE in PERFILES_RENDER else "completo")
+    huellas = cargar_huellas()
+    alcance = alcance_crawl(config.LIMIT_ONE_PAGE_PER_CATEGORY, max_pages)
+    planificador = PlanificadorRefresco()
+    omitidas: List[str] = []
+    try:
+        items = list(categorias_sitio().items())
+        if isinstance(config.MAX_CATEGORIES, int) and config.MAX_CATEGORIES > 0:
+            items = items[:config.MAX_CATEGORIES]
+
+        for nombre, url in items:
+            try:
+                # Solo --changed-only hace la carga liviana extra; cualquier crawl completo deja la
+                # huella al día con la que extraer_categoria lee al cargar la página 1
+                if config.CHANGED_ONLY:
+                    huella = _tomar_huella(supervisor, nombre, url)
+                    if categoria_sin_cambios(huellas, nombre, huella, alcance):
+                        LOGGER.info(f"[{nombre}] Sin cambios en el listado (huella {huella[0][:10]}). Se omite.")
+                        omitidas.append(nombre)
+                        continue
+
+                supervisor.cambiar_perfil(perfil_para_categoria(supervisor, nombre, url))
+
+                # Define archivos de salida para esta categoría por su clave
+                set_run_outputs(nombre)
+                estado: Dict[str, object] = {}
+                productos_cat = extraer_categoria(
+                    supervisor,
+                    url,
+                    nombre_categoria=nombre,
+                    limit_one_page=config.LIMIT_ONE_PAGE_PER_CATEGORY,
+                    max_pages=max_pages,
+                    estado=estado
+                )
+                # Guardado final (incremental ya se hizo)
+                guardar_json(productos_cat, salidas.RUN_JSON)
+                LOGGER.info(f"[{nombre}] Guardados {len(productos_cat)} productos en {salidas.RUN_JSON} y {salidas.RUN_JSONL}.")
+                marcar_crawl(nombre, url, bool(estado.get("completa")), alcance)
+                if estado.get("completa"):
+                    registrar_huella(huellas, nombre, estado.get("huella"), alcance)
+                planificador.registrar(nombre, productos_cat)
+                planificador.guardar()
+            except Exception as e:
+                LOGGER.warning(f"Error extrayendo categoría '{nombre}': {e}")
+                # No seguir con un driver posiblemente muerto
+                supervisor.verificar()
+                continue
+
+        if config.CHANGED_ONLY:
+            LOGGER.info(f"🔁 Categorías omitidas por no tener cambios: {len(omitidas)}/{len(items)}"
+                        + (f" -> {', '.join(omitidas)}" if omitidas else ""))
+        if supervisor.reinicios:
+            LOGGER.info(f"♻️ Reinicios del navegador durante la corrida: {supervisor.reinicios}")
+        LOGGER.info("✅ Proceso de scraping múltiple finalizado.")
+    finally:
+        supervisor.quit()
+        cerrar_detalle_fetcher()
+        exportar_selectores()
+
+
+# =========================
+# EJECUCIÓN DE UNA CATEGORÍA (--category)
+# =========================
+def extraer_una_categoria(nombre: str, url: str, max_pages: Optional[int] = None) -> None:
+    """Scrapea una sola categoría (clave de las categorías del sitio) en {clave}_formatted.json / .jsonl"""
+    supervisor = SupervisorDriver(config.RENDER_PROFILE if config.RENDER_PROFILE in PERFILES_RENDER else "completo")
+    try:
+        huellas = cargar_huellas()
+        alcance = alcance_crawl(config.LIMIT_ONE_PAGE_PER_CATEGORY, max_pages)
+        if config.CHANGED_ONLY and categoria_sin_cambios(huellas, nombre, _tomar_huella(supervisor, nombre, url), alcance):
+            LOGGER.info(f"🔁 [{nombre}] Sin cambios en el listado desde la última corrida. Nada que hacer.")
+            return
+
+        supervisor.cambiar_perfil(perfil_para_categoria(supervisor, nombre, url))
+
+        # Define archivos por la clave elegida (asegura p.ej. 'celulares_formatted.json')
+        set_run_outputs(nombre)
+
+        estado: Dict[str, object] = {}
+        productos = extraer_categoria(
+            supervisor,
+            url,
+            nombre_categoria=nombre,  # nombre guardado en el objeto
+            limit_one_page=config.LIMIT_ONE_PAGE_PER_CATEGORY,
+            max_pages=max_pages,
+            estado=estado
+        )
+        # Guardado final (incremental ya se hizo a RUN_JSONL)
+        guardar_json(productos, salidas.RUN_JSON)
+        LOGGER.info(f"Guardados {len(productos)} productos en {salidas.RUN_JSON} y {salidas.RUN_JSONL}.")
+        marcar_crawl(nombre, url, bool(estado.get("completa")), alcance)
+        if estado.get("completa"):
+            registrar_huella(huellas, nombre, estado.get("huella"), alcance)
+        planificador = PlanificadorRefresco()
+        planificador.registrar(nombre, productos)
+        planificador.guardar()
+    finally:
+        supervisor.quit()
+        cerrar_detalle_fetcher()
+        exportar_selectores()
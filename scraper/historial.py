@@ -0,0 +1,220 @@
+# scraper/historial.py
+# Estado entre corridas: huellas de listados (--changed-only) e historial de precios (--budget-pages).
+import json
+import hashlib
+import heapq
+import os
+import os.path as osp
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from scraper import config
+from scraper.categorias import categorias_sitio
+from scraper.parsers import slugify
+from scraper.salidas import Producto
+from scraper.sitios import get_sitio
+
+
+# =========================
+# DETECCIÓN DE CAMBIOS (huella de la primera página)
+# =========================
+def cargar_huellas(ruta: Optional[str] = None) -> Dict[str, dict]:
+    ruta = ruta or config.FINGERPRINTS_JSON
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_huellas(huellas: Dict[str, dict], ruta: Optional[str] = None) -> None:
+    ruta = ruta or config.FINGERPRINTS_JSON
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(huellas, f, ensure_ascii=False, indent=4)
+    os.replace(tmp, ruta)
+
+
+def calcular_huella(items: List[Tuple[str, str]]) -> str:
+    """Huella estable a partir de pares (product_id|link, precio_texto) del listado."""
+    limpiar = get_sitio().limpiar_precio
+    partes = sorted(f"{pid}:{limpiar(precio)[1]}" for pid, precio in items)
+    return hashlib.sha1("\n".join(partes).encode("utf-8")).hexdigest()
+
+
+def alcance_crawl(limit_one_page: bool, max_pages: Optional[int]) -> dict:
+    """Alcance de un crawl: páginas pedidas (None = todas) y si se leyeron los detalles de ficha."""
+    return {"paginas": 1 if limit_one_page else max_pages, "detalles": not config.FAST_MODE}
+
+
+def _alcance_cubre(previo: Optional[dict], actual: dict) -> bool:
+    """True si un crawl con alcance 'previo' ya contiene todo lo que pide 'actual'."""
+    if not previo:
+        return False
+    pp, pa = previo.get("paginas"), actual.get("paginas")
+    if pp is not None and (pa is None or pp < pa):
+        return False
+    return bool(previo.get("detalles")) or not actual.get("detalles")
+
+
+def categoria_sin_cambios(huellas: Dict[str, dict], nombre: str, huella: Optional[Tuple[str, int]],
+                          alcance: dict) -> bool:
+    """
+    True si la huella coincide con la del último crawl completo, ese crawl cubrió al menos el
+    alcance pedido ahora (páginas / detalles) y los archivos de salida siguen existiendo.
+    """
+    if huella is None:
+        return False
+    previa = huellas.get(nombre) or {}
+    if previa.get("huella") != huella[0] or not _alcance_cubre(previa.get("alcance"), alcance):
+        return False
+    slug = slugify(nombre)
+    return osp.exists(osp.join(config.OUT_DIR, f"{slug}_formatted.jsonl"))
+
+
+def registrar_huella(huellas: Dict[str, dict], nombre: str, huella: Optional[Tuple[str, int]],
+                     alcance: dict) -> None:
+    """Se llama tras cada crawl terminado (no abandonado), con o sin --changed-only."""
+    if huella is None:
+        return
+    huellas[nombre] = {
+        "huella": huella[0],
+        "pods_primera_pagina": huella[1],
+        "alcance": alcance,
+        "fecha": datetime.now().isoformat(),
+    }
+    guardar_huellas(huellas)
+
+
+# =========================
+# PLANIFICADOR DE REFRESCOS (por volatilidad de precios)
+# =========================
+class PlanificadorRefresco:
+    """
+    Asigna a cada producto un intervalo de refresco según la frecuencia histórica de cambios de precio
+    (suavizada con la tasa de su categoría) y mantiene una cola de prioridad de páginas de listado vencidas.
+
+    Una página de listado es la unidad de trabajo: recargarla refresca todos sus productos de una vez,
+    así que su prioridad es la suma de lo vencido de sus productos.
+    """
+
+    INTERVALO_MIN_H = 2.0
+    INTERVALO_MAX_H = 7 * 24.0
+    PESO_CATEGORIA_H = 24.0  # horas "virtuales" de observación que aporta la tasa de la categoría
+    MAX_PRECIOS = 20         # precios recientes que se guardan por producto
+    MAX_AUSENCIAS = 3        # refrescos de su página sin aparecer antes de olvidar un producto
+
+    def __init__(self, ruta: Optional[str] = None):
+        self.ruta = ruta or config.HISTORIAL_JSON
+        self.historial: Dict[str, dict] = self._cargar()
+
+    def _cargar(self) -> Dict[str, dict]:
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def guardar(self) -> None:
+        tmp = self.ruta + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.historial, f, ensure_ascii=False)
+        os.replace(tmp, self.ruta)
+
+    def registrar(self, clave_categoria: str, productos: List[Producto]) -> None:
+        """Actualiza el historial con los productos recién extraídos de la categoría 'clave_categoria'."""
+        sitio = get_sitio()
+        for p in productos:
+            pid = sitio.extraer_product_id(p.link) or p.link.split("?")[0]
+            h = self.historial.setdefault(pid, {
+                "clave": clave_categoria, "precios": [], "cambios": 0, "observaciones": 0,
+            })
+            precios = h["precios"]
+            if p.precio_valor is not None:
+                if precios and precios[-1] != p.precio_valor:
+                    h["cambios"] += 1
+                precios.append(p.precio_valor)
+                del precios[:-self.MAX_PRECIOS]
+            h["observaciones"] += 1
+            h["clave"] = clave_categoria
+            h["link"] = p.link
+            h["pagina"] = p.pagina
+            h.setdefault("primera_visita", h.get("ultima_visita") or p.fecha_extraccion)
+            h["ultima_visita"] = p.fecha_extraccion
+            h["ausencias"] = 0
+
+    def registrar_pagina(self, clave_categoria: str, pagina: int, productos: List[Producto],
+                         fecha: Optional[str] = None) -> None:
+        """
+        Registra el refresco completo de una página de listado. Los productos que el historial
+        ubicaba en esa página y no aparecieron (salieron del catálogo o cambiaron de página) cuentan
+        como visitados, así no la vuelven a pedir en cada corrida; tras MAX_AUSENCIAS se olvidan.
+        """
+        self.registrar(clave_categoria, productos)
+        sitio = get_sitio()
+        vistos = {sitio.extraer_product_id(p.link) or p.link.split("?")[0] for p in productos}
+        fecha = fecha or datetime.now().isoformat()
+        for pid in list(self.historial):
+            h = self.historial[pid]
+            if pid in vistos or h.get("clave") != clave_categoria or h.get("pagina") != pagina:
+                continue
+            h["ausencias"] = h.get("ausencias", 0) + 1
+            h["ultima_visita"] = fecha
+            if h["ausencias"] >= self.MAX_AUSENCIAS:
+                del self.historial[pid]
+
+    @staticmethod
+    def _horas_observadas(h: dict) -> float:
+        try:
+            delta = datetime.fromisoformat(h["ultima_visita"]) - datetime.fromisoformat(h["primera_visita"])
+            return max(delta.total_seconds() / 3600.0, 0.0)
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+    def _tasas_categoria(self) -> Dict[str, float]:
+        """Cambios de precio por hora observada, por categoría."""
+        cambios: Dict[str, int] = {}
+        horas: Dict[str, float] = {}
+        for h in self.historial.values():
+            c = h.get("clave", "")
+            cambios[c] = cambios.get(c, 0) + h.get("cambios", 0)
+            horas[c] = horas.get(c, 0.0) + self._horas_observadas(h)
+        return {c: (cambios[c] / horas[c] if horas[c] else 0.0) for c in cambios}
+
+    def intervalo_horas(self, h: dict, tasa_categoria: float) -> float:
+        """Tiempo medio entre cambios de precio (1 / cambios por hora), suavizado con la tasa de la categoría."""
+        tasa = (h.get("cambios", 0) + tasa_categoria * self.PESO_CATEGORIA_H) / (self._horas_observadas(h) + self.PESO_CATEGORIA_H)
+        if tasa <= 0:
+            return self.INTERVALO_MAX_H
+        return min(max(1.0 / tasa, self.INTERVALO_MIN_H), self.INTERVALO_MAX_H)
+
+    def cola_paginas(self, ahora: Optional[datetime] = None) -> List[Tuple[float, str, int]]:
+        """Heap de (-prioridad, clave_categoria, pagina) con las páginas que tienen productos vencidos."""
+        ahora = ahora or datetime.now()
+        tasas = self._tasas_categoria()
+        categorias = categorias_sitio()
+        prioridad: Dict[Tuple[str, int], float] = {}
+        for h in self.historial.values():
+            clave, pagina = h.get("clave"), h.get("pagina")
+            if clave not in categorias or not isinstance(pagina, int):
+                continue
+            try:
+                edad_h = (ahora - datetime.fromisoformat(h["ultima_visita"])).total_seconds() / 3600.0
+            except (KeyError, TypeError, ValueError):
+                edad_h = self.INTERVALO_MAX_H
+            vencido = edad_h / self.intervalo_horas(h, tasas.get(clave, 0.0))
+            if vencido >= 1.0:
+                prioridad[(clave, pagina)] = prioridad.get((clave, pagina), 0.0) + vencido
+        heap = [(-prio, clave, pagina) for (clave, pagina), prio in prioridad.items()]
+        heapq.heapify(heap)
+        return heap
+
+    def siguientes(self, presupuesto_paginas: int, ahora: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        heap = self.cola_paginas(ahora)
+        plan: List[Tuple[str, int]] = []
+        while heap and len(plan) < presupuesto_paginas:
+            _, clave, pagina = heapq.heappop(heap)
+            plan.append((clave, pagina))
+        return plan
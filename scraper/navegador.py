@@ -0,0 +1,1172 @@
+# scraper/navegador.py
+# Todo lo que usa Selenium: driver, supervisor/watchdog, perfiles de render y extracción de páginas.
+import time
+import json
+import re
+import os
+import inspect
+import threading
+from contextlib import nullcontext
+from typing import List, Tuple, Optional, Set, Dict
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    TimeoutException,
+    NoSuchElementException,
+    WebDriverException,
+)
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from scraper import config
+from scraper import salidas
+from scraper.categorias import url_pagina
+from scraper.config import LOGGER, nap
+from scraper.detalles import get_detalle_fetcher
+from scraper.historial import calcular_huella
+from scraper.salidas import Producto, append_jsonl
+from scraper.selectores import get_selectores
+from scraper.sitios import get_sitio
+from scraper.snapshots import get_snapshots, snapshot_html
+
+
+# =========================
+# EXTRACCIONES / SELECTORES
+# =========================
+def scroll_cargar_todos(
+    driver,
+    contenedor_selector: Optional[str] = None,
+    max_sin_cambios=6,
+    paso_px=1600,
+    espera=1.8
+) -> int:
+    """
+    Scrollea hasta que no haya cambios de altura / nuevos pods por 'max_sin_cambios' iteraciones.
+    En FAST_MODE, ajusta para aún hacer un scroll suficiente para lazy-load.
+    En REPLAY_MODE el snapshot ya tiene todos los pods: solo se cuentan.
+    """
+    sitio = get_sitio()
+    contenedor_selector = contenedor_selector or sitio.sel_listado
+    if config.REPLAY_MODE:
+        return len(driver.find_elements(By.CSS_SELECTOR, f"{contenedor_selector} {sitio.sel_pod}"))
+    if config.FAST_MODE:
+        max_sin_cambios = 4
+        espera = 1.0
+
+    seen = 0
+    sin_cambios = 0
+    last_height = driver.execute_script("return document.body.scrollHeight")
+    while sin_cambios < max_sin_cambios:
+        driver.execute_script(f"window.scrollBy(0, {paso_px});")
+        time.sleep(espera)
+        try:
+            contenedor = driver.find_element(By.CSS_SELECTOR, contenedor_selector)
+            pods = contenedor.find_elements(By.CSS_SELECTOR, sitio.sel_pod)
+            nuevos = len(pods)
+        except StaleElementReferenceException:
+            nuevos = seen
+
+        height = driver.execute_script("return document.body.scrollHeight")
+        if nuevos == seen and height == last_height:
+            sin_cambios += 1
+        else:
+            sin_cambios = 0
+            seen = nuevos
+            last_height = height
+    return seen
+
+
+def extraer_precio_crudo_listado(pod) -> str:
+    return get_selectores().primer_texto(pod, "precio", aguja=get_sitio().aguja_precio) or ""
+
+
+def extraer_precio_listado(pod) -> Tuple[str, Optional[int], Optional[str]]:
+    txt = extraer_precio_crudo_listado(pod)
+    return get_sitio().limpiar_precio(txt) if txt else ("N/A", None, None)
+
+
+def extraer_calificacion_listado(pod) -> str:
+    try:
+        sitio = get_sitio()
+        el = pod.find_element(By.CSS_SELECTOR, sitio.sel_calificacion_pod)
+        val = el.get_attribute(sitio.attr_calificacion_pod) if sitio.attr_calificacion_pod else el.text
+        return val.strip() if val else "N/A"
+    except Exception:
+        return "N/A"
+
+
+def extraer_calificacion_ficha(driver) -> str:
+    sitio = get_sitio()
+    if not sitio.xpath_calificacion_ficha:
+        return "N/A"
+    try:
+        el = driver.find_element(By.XPATH, sitio.xpath_calificacion_ficha)
+        return sitio.extraer_calificacion_texto(el.get_attribute("aria-label") or el.text)
+    except Exception:
+        return "N/A"
+
+
+def esperar_ficha(driver) -> bool:
+    """Espera el bloque sel_ficha (12 s; en replay el snapshot ya está completo, basta un momento)."""
+    try:
+        WebDriverWait(driver, 2 if config.REPLAY_MODE else 12).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, get_sitio().sel_ficha))
+        )
+        return True
+    except Exception:
+        return False
+
+
+def extraer_detalles_ficha_texto(driver) -> str:
+    try:
+        return driver.find_element(By.CSS_SELECTOR, get_sitio().sel_ficha).text.strip()
+    except Exception:
+        return ""
+
+
+def obtener_nombre_categoria(driver) -> str:
+    # 1) H1
+    try:
+        h1 = driver.find_element(By.TAG_NAME, "h1").text.strip()
+        if h1:
+            return h1
+    except Exception:
+        pass
+
+    # 2) Breadcrumb
+    try:
+        crumb = driver.find_elements(By.CSS_SELECTOR, "nav [aria-label*='breadcrumb' i], nav[aria-label*='breadcrumb' i], nav.breadcrumb, ol.breadcrumb")
+        if crumb:
+            txt = crumb[0].text.strip()
+            if txt:
+                last = txt.split("\n")[-1].strip()
+                if last:
+                    return last
+    except Exception:
+        pass
+
+    # 3) og:title
+    try:
+        og = driver.find_elements(By.CSS_SELECTOR, "meta[property='og:title'], meta[name='og:title']")
+        if og:
+            val = (og[0].get_attribute("content") or "").strip()
+            if val:
+                val = get_sitio().limpiar_nombre_categoria(val)
+                if val:
+                    return val
+    except Exception:
+        pass
+
+    # 4) <title>
+    try:
+        t = (driver.title or "").strip()
+        if t:
+            t = get_sitio().limpiar_nombre_categoria(t)
+            if t:
+                return t
+    except Exception:
+        pass
+
+    # 5) Fallback URL (según el sitio; p. ej. evitar ids cat12345)
+    try:
+        nombre = get_sitio().nombre_categoria_desde_url(driver.current_url)
+        if nombre:
+            return nombre
+    except Exception:
+        pass
+
+    return "N/A"
+
+
+# =========================
+# CONTADOR GLOBAL
+# =========================
+_EXTRACCION_TOTAL = 1
+
+# En replay la fecha de extracción es la del snapshot, no la de reprocesamiento
+_FECHA_EXTRACCION_FIJA: Optional[str] = None
+
+
+def reiniciar_contador_extraccion() -> None:
+    global _EXTRACCION_TOTAL
+    _EXTRACCION_TOTAL = 1
+
+
+def fijar_fecha_extraccion(fecha: Optional[str]) -> None:
+    global _FECHA_EXTRACCION_FIJA
+    _FECHA_EXTRACCION_FIJA = fecha
+
+
+# =========================
+# CARGA ROBUSTA CON REINTENTOS
+# =========================
+def safe_get(driver, url: str, retries: int = 3, wait_between=(2.0, 4.0)) -> None:
+    last_err = None
+    for attempt in range(1, retries + 1):
+        try:
+            driver.get(url)
+            return
+        except TimeoutException as e:
+            last_err = e
+            try:
+                driver.execute_script("window.stop();")
+                return
+            except Exception:
+                pass
+            LOGGER.warning(f"safe_get timeout {attempt}/{retries} para {url}: {e}")
+            nap(*wait_between)
+        except Exception as e:
+            last_err = e
+            LOGGER.warning(f"safe_get error {attempt}/{retries} para {url}: {e}")
+            nap(*wait_between)
+    if last_err:
+        raise last_err
+
+
+# =========================
+# DESCUBRIMIENTO DE CATEGORÍAS (no usado en CLI, se mantiene como helper)
+# =========================
+def descubrir_links_categorias(driver) -> Dict[str, str]:
+    sitio = get_sitio()
+    safe_get(driver, sitio.home_url)
+    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    nap(1.5, 2.5)
+
+    enlaces = driver.find_elements(By.CSS_SELECTOR, "a[href]")
+    cats: Dict[str, str] = {}
+    vistos: Set[str] = set()
+
+    for a in enlaces:
+        try:
+            href = a.get_attribute("href") or ""
+            if not href:
+                continue
+            if sitio.es_link_categoria(href):
+                txt = (a.text or "").strip()
+                nombre = txt if txt else sitio.nombre_categoria_desde_url(href)
+                if nombre and href not in vistos:
+                    cats[nombre] = href
+                    vistos.add(href)
+        except Exception:
+            continue
+
+    LOGGER.info(f"Categorias descubiertas: {len(cats)}")
+    return cats
+
+
+# =========================
+# EXTRACCIÓN DE UNA PÁGINA (INCREMENTAL + DEDUP)
+# =========================
+def _titulo_desde_pod(pod) -> str:
+    t = get_selectores().primer_texto(pod, "titulo")
+    if t:
+        return t
+
+    img_elem = pod.find_elements(By.CSS_SELECTOR, f"{get_sitio().sel_imagen_pod}, img[alt]")
+    if img_elem:
+        alt = (img_elem[0].get_attribute("alt") or "").strip()
+        if alt:
+            return alt
+    return "N/A"
+
+
+def grabar_pod(crudo: dict, pod) -> None:
+    """--grabar-pods: guarda lo leído del pod y su texto visible (sin 'esperado': se etiqueta a mano)."""
+    try:
+        texto = pod.text
+    except Exception:
+        texto = ""
+    os.makedirs(os.path.dirname(config.GRABAR_PODS) or ".", exist_ok=True)
+    with open(config.GRABAR_PODS, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"crudo": crudo, "texto_pod": texto}, ensure_ascii=False) + "\n")
+
+
+def _detalles_via_ventana(driver, link: str, obtener_detalles: bool, calificacion: str) -> Tuple[str, str]:
+    """Respaldo: abre la ficha en otra ventana y lee el bloque sel_ficha del sitio / aria-label del rating."""
+    detalles_adicionales = ""
+    destino = link
+    if config.REPLAY_MODE:
+        store = get_snapshots()
+        entrada = store.ultima_entrada("ficha", link, corrida=config.REPLAY_CORRIDA) if store is not None else None
+        if not entrada:
+            return detalles_adicionales, calificacion
+        destino = "file://" + store.archivo_local(entrada["sha"], entrada.get("formato", "html"))
+    original_window = driver.current_window_handle
+    if getattr(driver, "_urls_bloqueadas", None):
+        # La ventana nueva es otro target: se abre vacía, se bloquea CSS/fuentes y recién ahí se navega
+        driver.execute_script("window.open('about:blank');")
+        driver.switch_to.window(driver.window_handles[-1])
+        bloquear_urls_pestana(driver)
+        driver.execute_script("window.location.href = arguments[0];", destino)
+    else:
+        driver.execute_script("window.open(arguments[0]);", destino)
+        driver.switch_to.window(driver.window_handles[-1])
+    try:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAGNAME, "body")))
+    except Exception:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    try:
+        nap(0.6, 1.0) if config.FAST_MODE else nap(1.0, 2.0)
+        # El snapshot va después de la espera: guarda la ficha tal como se lee en vivo (con su bloque sel_ficha)
+        esperar_ficha(driver)
+        snapshot_html(driver, "ficha", url=link)
+        if obtener_detalles:
+            detalles_adicionales = extraer_detalles_ficha_texto(driver)
+        if calificacion in {"N/A", "", "0"}:
+            calificacion = extraer_calificacion_ficha(driver)
+    except Exception as e:
+        if _sesion_muerta(e):
+            raise
+    finally:
+        driver.close()
+        driver.switch_to.window(original_window)
+    return detalles_adicionales, calificacion
+
+
+def extraer_productos_pagina(
+    driver,
+    contador_inicio=1,
+    pagina_actual=1,
+    categoria_actual="N/A",
+    obtener_detalles=False,
+    vistos_links: Optional[Set[str]] = None,
+    destino: Optional[List[Producto]] = None,
+    cancelacion: Optional["TokenCancelacion"] = None
+) -> Tuple[List[Producto], int]:
+    """
+    Guarda cada producto en JSONL apenas se crea, evitando duplicados con 'vistos_links'.
+    Los detalles/rating de ficha se piden en lote a la API interna (USE_DETAIL_API) y solo
+    los que fallan se abren en una ventana del navegador.
+    Si se pasa 'destino', cada producto también se agrega ahí en cuanto se guarda (así el
+    supervisor conserva lo ya extraído aunque la página se cuelgue a mitad).
+    Con 'cancelacion' (la pasa SupervisorDriver.ejecutar) el hilo deja de publicar productos en
+    cuanto el watchdog abandona el intento, y cada ficha abierta en ventana extiende el plazo.
+    """
+    global _EXTRACCION_TOTAL
+    if vistos_links is None:
+        vistos_links = set()
+    sitio = get_sitio()
+
+    scroll_cargar_todos(driver)
+    snapshot_html(
+        driver, "listado",
+        clave=salidas.RUN_CLAVE, sufijo=salidas.RUN_SUFIJO, pagina=pagina_actual,
+        categoria=categoria_actual, detalles=bool(obtener_detalles)
+    )
+    pods = driver.find_elements(By.CSS_SELECTOR, sitio.sel_pods)
+    LOGGER.info(f"[{categoria_actual}] Pods detectados en página {pagina_actual}: {len(pods)}")
+
+    # 1) Lectura del listado (navegador) + parseo del sitio (Python puro, SiteAdapter.parsear_item)
+    candidatos: List[dict] = []
+    links_pagina: Set[str] = set()
+    for i, pod in enumerate(pods, start=1):
+        try:
+            link = pod.get_attribute("href")
+            if not link:
+                continue
+
+            if link in vistos_links or link in links_pagina:
+                continue
+
+            titulo = _titulo_desde_pod(pod)
+            img_elem = pod.find_elements(By.CSS_SELECTOR, sitio.sel_imagen_pod)
+            imagen = img_elem[0].get_attribute("src") if img_elem and img_elem[0].get_attribute("src") else "N/A"
+
+            if titulo == "N/A":
+                child_texts = [e.text.strip() for e in pod.find_elements(By.CSS_SELECTOR, "*") if e.text.strip()]
+                if child_texts:
+                    titulo = child_texts[0]
+
+            # Descartar antes de leer precio/rating (ahorra round-trips en pods promocionales)
+            if sitio.titulo_descartado(titulo):
+                continue
+
+            crudo = {
+                "link": link,
+                "titulo": titulo,
+                "imagen": imagen,
+                "precio_crudo": extraer_precio_crudo_listado(pod),
+                "calificacion": extraer_calificacion_listado(pod),
+            }
+            if config.GRABAR_PODS:
+                grabar_pod(crudo, pod)
+            item = sitio.parsear_item(crudo)
+            if item is None:
+                continue
+            item["i"] = i
+            candidatos.append(item)
+            links_pagina.add(link)
+        except Exception as e:
+            # Un pod raro se salta; una sesión muerta corta la página (el supervisor reinicia y reencola)
+            if _sesion_muerta(e):
+                raise
+            LOGGER.debug(f"[{categoria_actual}] Error en pod {i} de página {pagina_actual}: {e}")
+
+    # 2) Detalles de ficha: API en lote, ventana solo como respaldo
+    pendientes = [c for c in candidatos if obtener_detalles or c["calificacion"] in {"N/A", "", "0"}]
+    respuestas_api: Dict[str, Optional[Tuple[str, str]]] = {}
+    fetcher = get_detalle_fetcher() if config.USE_DETAIL_API and pendientes else None
+    if fetcher is not None:
+        pedidos = [(c["link"], obtener_detalles, c["calificacion"] in {"N/A", "", "0"}) for c in pendientes]
+        t0 = time.time()
+        resultados = fetcher.obtener_lote(pedidos)
+        respuestas_api = {c["link"]: r for c, r in zip(pendientes, resultados)}
+        ok = sum(1 for r in resultados if r is not None)
+        LOGGER.info(f"[{categoria_actual}] Detalles vía API: {ok}/{len(pedidos)} en {time.time() - t0:.2f}s")
+
+    productos: List[Producto] = []
+    contador = contador_inicio
+
+    # 3) Construcción + guardado incremental
+    for c in candidatos:
+        if cancelacion is not None and cancelacion.cancelado:
+            break
+        try:
+            link, titulo = c["link"], c["titulo"]
+            calificacion = c["calificacion"]
+            detalles_adicionales = ""
+            uso_ventana = False
+
+            if obtener_detalles or calificacion in {"N/A", "", "0"}:
+                api = respuestas_api.get(link)
+                if api is not None:
+                    detalles_api, calificacion_api = api
+                    if fetcher.grabando:
+                        # Grabando fixtures: la ficha renderizada es lo esperado para el parseo de la API
+                        if cancelacion is not None:
+                            cancelacion.extender(config.WATCHDOG_POR_FICHA_S)
+                        detalles_ficha, calificacion_ficha = _detalles_via_ventana(driver, link, obtener_detalles, "N/A")
+                        esperado = {}
+                        if obtener_detalles:
+                            esperado["detalles_adicionales"] = detalles_ficha
+                        if calificacion in {"N/A", "", "0"}:
+                            esperado["calificacion"] = calificacion_ficha
+                        fetcher.registrar_caso(link, api, esperado)
+                        uso_ventana = True
+                    if obtener_detalles:
+                        detalles_adicionales = detalles_api
+                    if calificacion in {"N/A", "", "0"}:
+                        calificacion = calificacion_api
+                else:
+                    if cancelacion is not None:
+                        cancelacion.extender(config.WATCHDOG_POR_FICHA_S)
+                    detalles_adicionales, calificacion = _detalles_via_ventana(
+                        driver, link, obtener_detalles, calificacion
+                    )
+                    uso_ventana = True
+
+            precio_txt, precio_num, moneda = c["precio"]
+
+            producto = Producto(
+                contador_extraccion_total=_EXTRACCION_TOTAL,
+                contador_extraccion=contador,
+                titulo=titulo if titulo else "N/A",
+                marca=c["marca"],
+                precio_texto=precio_txt,
+                precio_valor=precio_num,
+                moneda=moneda,
+                tamaño=c["tamaño"],
+                calificacion=calificacion if calificacion else "N/A",
+                detalles_adicionales=detalles_adicionales,
+                fuente=sitio.fuente,
+                categoria=categoria_actual,
+                imagen=c["imagen"],
+                link=link,
+                pagina=pagina_actual,
+                fecha_extraccion=_FECHA_EXTRACCION_FIJA or datetime.now().isoformat(),
+                extraction_status="success" if precio_num is not None else "failed"
+            )
+
+            if producto.precio_valor is None and sitio.titulo_descartado(producto.titulo or ""):
+                continue
+
+            # Incremental inmediato hacia el archivo de la corrida (RUN_JSONL); si el watchdog ya
+            # abandonó este intento no se publica nada (el reintento/la categoría siguiente siguen solos)
+            with cancelacion.lock if cancelacion is not None else nullcontext():
+                if cancelacion is not None and cancelacion.cancelado:
+                    break
+                append_jsonl(producto)
+                vistos_links.add(link)
+
+                productos.append(producto)
+                if destino is not None:
+                    destino.append(producto)
+                contador += 1
+                _EXTRACCION_TOTAL += 1
+
+            # Pausa anti-bot solo cuando se abrió una ficha en el navegador
+            if uso_ventana:
+                nap(0.15, 0.4) if config.FAST_MODE else nap(0.25, 0.7)
+
+        except Exception as e:
+            if _sesion_muerta(e):
+                raise
+            LOGGER.debug(f"[{categoria_actual}] Error en pod {c['i']} de página {pagina_actual}: {e}")
+
+    return productos, contador
+
+
+# =========================
+# NAVEGACIÓN PAGINACIÓN
+# =========================
+def ir_a_siguiente_pagina(driver) -> bool:
+    try:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        nap(0.5, 1.0) if config.FAST_MODE else nap(0.8, 1.8)
+
+        perfil = get_selectores()
+        sels = perfil.orden("siguiente_pagina")
+        posibles_botones = []
+        idx = -1
+        for i, sel in enumerate(sels):
+            posibles_botones = driver.find_elements(By.CSS_SELECTOR, sel)
+            if posibles_botones:
+                idx = i
+                break
+        perfil.registrar("siguiente_pagina", sels, idx)
+
+        if not posibles_botones:
+            return False
+
+        siguiente_btn = posibles_botones[-1]
+        pods = driver.find_elements(By.CSS_SELECTOR, get_sitio().sel_pods)
+        primer_pod = pods[0] if pods else None
+        old_url = driver.current_url
+
+        try:
+            driver.execute_script("arguments[0].click();", siguiente_btn)
+        except ElementClickInterceptedException:
+            nap(0.3, 0.7) if config.FAST_MODE else nap(0.6, 1.2)
+            driver.execute_script("arguments[0].click();", siguiente_btn)
+
+        try:
+            if primer_pod:
+                WebDriverWait(driver, 15).until(EC.staleness_of(primer_pod))
+            WebDriverWait(driver, 10).until(lambda d: d.current_url != old_url)
+        except Exception:
+            pass
+
+        nap(0.5, 1.0) if config.FAST_MODE else nap(0.8, 1.6)
+        return True
+
+    except TimeoutException:
+        return False
+    except WebDriverException as e:
+        # Sesión muerta no es "no hay más páginas": que el supervisor reinicie el navegador
+        if _sesion_muerta(e):
+            raise
+        return False
+    except Exception:
+        return False
+
+
+# =========================
+# DRIVER / OPTIONS
+# =========================
+# Perfiles de render, del más barato al más completo (ORDEN_COSTO_RENDER).
+#   completo: comportamiento original (1920x1080, imágenes, CSS, JIT).
+#   ligero  : sin imágenes, viewport pequeño, un solo proceso renderer.
+#   minimo  : además sin CSS ni fuentes (bloqueados por CDP, ver "bloquear_urls"), JS sin JIT y heap de V8 acotado.
+PERFILES_RENDER: Dict[str, dict] = {
+    "completo": {
+        "window_size": "1920,1080",
+        "args": [],
+        "prefs": {},
+    },
+    "ligero": {
+        "window_size": "1024,768",
+        "args": [
+            "--blink-settings=imagesEnabled=false",
+            "--renderer-process-limit=1",
+            "--disable-extensions",
+            "--mute-audio",
+        ],
+        "prefs": {"profile.managed_default_content_settings.images": 2},
+    },
+    "minimo": {
+        "window_size": "800,600",
+        "args": [
+            "--blink-settings=imagesEnabled=false",
+            "--renderer-process-limit=1",
+            "--disable-extensions",
+            "--mute-audio",
+            "--js-flags=--jitless --max-old-space-size=192",
+            "--disable-remote-fonts",
+            "--disable-smooth-scrolling",
+        ],
+        "prefs": {"profile.managed_default_content_settings.images": 2},
+        # Chrome no tiene content settings para CSS/fuentes: se bloquean por URL con Network.setBlockedURLs
+        "bloquear_urls": ["*.css", "*.css?*", "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.otf"],
+    },
+    # Solo para --replay: abre snapshots locales sin red (las URLs remotas fallan al resolver DNS)
+    "replay": {
+        "window_size": "1024,768",
+        "args": [
+            "--blink-settings=imagesEnabled=false",
+            "--host-resolver-rules=MAP * ~NOTFOUND",
+            "--allow-file-access-from-files",
+            "--disable-extensions",
+        ],
+        "prefs": {"profile.managed_default_content_settings.images": 2},
+    },
+}
+ORDEN_COSTO_RENDER: Tuple[str, ...] = ("minimo", "ligero", "completo")
+
+
+def crear_driver(perfil: str = "completo") -> webdriver.Chrome:
+    conf = PERFILES_RENDER.get(perfil) or PERFILES_RENDER["completo"]
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--window-size={conf['window_size']}")
+    for arg in conf["args"]:
+        options.add_argument(arg)
+    if conf["prefs"]:
+        options.add_experimental_option("prefs", conf["prefs"])
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--lang=es-CO")
+    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                         "AppleWebKit/537.36 (KHTML, like Gecko) "
+                         "Chrome/124.0.0.0 Safari/537.36")
+
+    # Red/TLS más tolerante
+    options.add_argument("--ignore-certificate-errors")
+    options.add_argument("--allow-insecure-localhost")
+    options.add_argument("--disable-features=ClientHints,OptimizationHints,InterestCohort,PrivacySandboxAdsApis")
+    options.add_argument("--disable-background-networking")
+
+    # Evitar WebGL en headless
+    options.add_argument("--disable-3d-apis")
+    options.add_argument("--disable-webgl")
+    options.add_argument("--disable-software-rasterizer")
+
+    options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    proxy = os.getenv("HTTPS_PROXY") or os.getenv("HTTP_PROXY")
+    if proxy:
+        options.add_argument(f"--proxy-server={proxy}")
+
+    from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+    caps = DesiredCapabilities.CHROME.copy()
+    caps["acceptInsecureCerts"] = True
+    for key, value in caps.items():
+        options.set_capability(key, value)
+
+    # Carga más ágil
+    options.set_capability("pageLoadStrategy", "eager")
+
+    remote_url = os.getenv("SELENIUM_REMOTE_URL")
+    if remote_url:
+        driver = webdriver.Remote(command_executor=remote_url, options=options)
+    else:
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=options)
+
+    driver.set_page_load_timeout(90)
+    driver.set_script_timeout(90)
+    # El bloqueo CDP vale solo para la pestaña actual: se guarda en el driver para repetirlo en cada
+    # ventana nueva (fichas de _detalles_via_ventana)
+    driver._urls_bloqueadas = conf.get("bloquear_urls") or []
+    if driver._urls_bloqueadas and not bloquear_urls_pestana(driver):
+        LOGGER.warning(f"Perfil '{perfil}': no se pudo bloquear CSS/fuentes vía CDP.")
+    return driver
+
+
+def bloquear_urls_pestana(driver) -> bool:
+    """Aplica el bloqueo de URLs del perfil (Network.setBlockedURLs) a la pestaña actual."""
+    urls = getattr(driver, "_urls_bloqueadas", None)
+    if not urls:
+        return True
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        return True
+    except Exception as e:
+        LOGGER.debug(f"No se pudo bloquear URLs en la pestaña: {e}")
+        return False
+
+
+# =========================
+# SUPERVISIÓN DEL DRIVER (watchdog + reinicio)
+# =========================
+class TokenCancelacion:
+    """
+    Estado de un intento bajo el watchdog: plazo (extensible por el propio trabajo mientras avanza)
+    y marca de cancelación. Las escrituras del trabajo se hacen bajo 'lock' comprobando 'cancelado',
+    así después de cancelar() el hilo abandonado ya no toca salidas ni estructuras compartidas.
+    """
+
+    def __init__(self, timeout: float):
+        self.lock = threading.Lock()
+        self._evento = threading.Event()
+        self.limite = time.monotonic() + timeout
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+    def extender(self, segundos: float) -> None:
+        self.limite = max(self.limite, time.monotonic() + segundos)
+
+    def cancelar(self) -> None:
+        with self.lock:
+            self._evento.set()
+
+
+class WatchdogTimeout(Exception):
+    """La unidad de trabajo superó su tiempo máximo y el navegador fue reiniciado."""
+
+
+# Mensajes de WebDriverException que indican que la sesión/renderer murió
+_SESION_MUERTA_PAT = re.compile(
+    r"invalid session id|session deleted|chrome not reachable|tab crashed|target window already closed"
+    r"|disconnected|no such window|renderer",
+    re.I
+)
+
+
+def _sesion_muerta(e: BaseException) -> bool:
+    return isinstance(e, WebDriverException) and bool(_SESION_MUERTA_PAT.search(str(e)))
+
+
+class SupervisorDriver:
+    """
+    Ejecuta cada unidad de trabajo (cargar una página, extraerla, pasar a la siguiente) en un hilo
+    con un límite duro de tiempo. Si se cuelga, mata el proceso de Chrome/chromedriver, crea un
+    driver nuevo y lanza WatchdogTimeout para que el llamador reencole la unidad. Si el navegador
+    muere (crash del renderer, sesión inválida) también se reinicia.
+    """
+
+    def __init__(self, perfil: str = "completo"):
+        self.perfil = perfil
+        self.driver = crear_driver(perfil)
+        self.reinicios = 0
+        self.cpu_previo = 0.0  # CPU acumulada del navegador actual en la última medición
+
+    def cambiar_perfil(self, perfil: str) -> None:
+        """Recrea el navegador con otro perfil de render (no hace nada si ya es el actual)."""
+        if perfil == self.perfil:
+            return
+        LOGGER.info(f"🎚️ Perfil de render: {self.perfil} -> {perfil}")
+        self.quit()
+        self.perfil = perfil
+        self.driver = crear_driver(perfil)
+        self.cpu_previo = 0.0
+
+    def _matar(self) -> None:
+        driver = self.driver
+        proceso = getattr(getattr(driver, "service", None), "process", None)
+        if proceso is not None:
+            try:
+                import psutil  # opcional: permite matar también los procesos chrome hijos
+                for hijo in psutil.Process(proceso.pid).children(recursive=True):
+                    hijo.kill()
+            except Exception:
+                pass
+            try:
+                proceso.kill()
+            except Exception:
+                pass
+        # quit() puede bloquearse si el navegador está colgado: se hace en segundo plano
+        threading.Thread(target=driver.quit, daemon=True).start()
+
+    def reiniciar(self, motivo: str) -> None:
+        LOGGER.warning(f"♻️ Reiniciando navegador ({motivo}).")
+        self._matar()
+        self.reinicios += 1
+        self.driver = crear_driver(self.perfil)
+        self.cpu_previo = 0.0
+
+    def ejecutar(self, fn, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Llama fn(driver, *args, **kwargs) con watchdog de 'timeout' segundos. Si fn acepta
+        'cancelacion' recibe un TokenCancelacion: puede extender el plazo y, si el watchdog vence,
+        se cancela antes de reiniciar el navegador.
+        """
+        timeout = timeout or config.WATCHDOG_PAGINA_S
+        resultado: Dict[str, object] = {}
+        token = TokenCancelacion(timeout)
+        try:
+            if "cancelacion" in inspect.signature(fn).parameters:
+                kwargs["cancelacion"] = token
+        except (TypeError, ValueError):
+            pass
+
+        def _run():
+            try:
+                resultado["ok"] = fn(self.driver, *args, **kwargs)
+            except BaseException as e:
+                resultado["error"] = e
+
+        hilo = threading.Thread(target=_run, daemon=True)
+        hilo.start()
+        while hilo.is_alive():
+            restante = token.limite - time.monotonic()
+            if restante <= 0:
+                break
+            hilo.join(min(restante, 5.0))
+        if hilo.is_alive():
+            token.cancelar()
+            self.reiniciar(f"{getattr(fn, '__name__', 'tarea')} superó el plazo ({timeout:.0f}s + extensiones)")
+            raise WatchdogTimeout(f"{getattr(fn, '__name__', 'tarea')} superó el plazo ({timeout:.0f}s + extensiones)")
+        if "error" in resultado:
+            err = resultado["error"]
+            if _sesion_muerta(err):
+                self.reiniciar(f"navegador caído: {str(err).splitlines()[0]}")
+            raise err
+        return resultado.get("ok")
+
+    def verificar(self) -> None:
+        """Comprueba que el driver responde; si no, lo reinicia."""
+        try:
+            self.ejecutar(lambda d: d.current_url, timeout=20)
+        except WatchdogTimeout:
+            pass
+        except Exception as e:
+            self.reiniciar(f"driver sin respuesta: {e}")
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception:
+            self._matar()
+
+
+# =========================
+# RECURSOS POR PÁGINA / PERFIL DE RENDER AUTOMÁTICO
+# =========================
+def medir_recursos(driver) -> Dict[str, float]:
+    """
+    RSS (MB) y CPU acumulada (s) del árbol chromedriver + Chrome con psutil si está instalado.
+    Sin psutil cae a las métricas de CDP del renderer: heap JS ('heap_js_mb', no es RSS) y duración
+    de tareas ('cpu_s'). {} si no hay forma.
+    """
+    proceso = getattr(getattr(driver, "service", None), "process", None)
+    if proceso is not None:
+        try:
+            import psutil
+            raiz = psutil.Process(proceso.pid)
+            procs = [raiz] + raiz.children(recursive=True)
+            rss = cpu = 0.0
+            for pr in procs:
+                try:
+                    rss += pr.memory_info().rss
+                    t = pr.cpu_times()
+                    cpu += t.user + t.system
+                except psutil.Error:
+                    continue
+            return {"rss_mb": rss / (1024 * 1024), "cpu_s": cpu, "fuente": "psutil"}
+        except Exception:
+            pass
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metricas = {m["name"]: m["value"] for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        return {"heap_js_mb": metricas.get("JSHeapTotalSize", 0.0) / (1024 * 1024),
+                "cpu_s": metricas.get("TaskDuration", 0.0), "fuente": "cdp"}
+    except Exception:
+        return {}
+
+
+def _sondear_listado(driver, url: str) -> Dict[str, float]:
+    """Carga y scrollea la primera página; cuenta pods y pods con precio, y mide el costo."""
+    antes = medir_recursos(driver)
+    cargar_listado(driver, url)
+    scroll_cargar_todos(driver)
+    sitio = get_sitio()
+    pods, con_precio = driver.execute_script("""
+        const pods = document.querySelectorAll(arguments[2]);
+        const sels = arguments[0], aguja = arguments[1];
+        let conPrecio = 0;
+        for (const p of pods) {
+            if (sels.some(sel => Array.from(p.querySelectorAll(sel)).some(el => (el.innerText || '').includes(aguja)))) conPrecio++;
+        }
+        return [pods.length, conPrecio];
+    """, get_selectores().orden("precio"), sitio.aguja_precio, sitio.sel_pods)
+    despues = medir_recursos(driver)
+    return {
+        "pods": pods,
+        "con_precio": con_precio,
+        "memoria_mb": despues.get("rss_mb", despues.get("heap_js_mb", 0.0)),
+        "fuente": despues.get("fuente", "N/A"),
+        "cpu_s": despues.get("cpu_s", 0.0) - antes.get("cpu_s", 0.0),
+    }
+
+
+def cargar_perfiles_render() -> Dict[str, dict]:
+    try:
+        with open(config.PERFILES_RENDER_JSON, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def calibrar_perfil_render(supervisor: SupervisorDriver, nombre: str, url: str) -> str:
+    """
+    Sondea la primera página con cada perfil y elige el más barato que encuentra los mismos pods
+    (y pods con precio) que el perfil completo. El resultado se guarda en PERFILES_RENDER_JSON.
+    """
+    resultados: Dict[str, Dict[str, float]] = {}
+    for perfil in reversed(ORDEN_COSTO_RENDER):  # primero "completo" como referencia
+        supervisor.cambiar_perfil(perfil)
+        try:
+            resultados[perfil] = supervisor.ejecutar(_sondear_listado, url, timeout=config.WATCHDOG_PAGINA_S)
+        except Exception as e:
+            LOGGER.warning(f"[{nombre}] Calibración con perfil '{perfil}' falló: {e}")
+            continue
+        r = resultados[perfil]
+        LOGGER.info(f"[{nombre}] Perfil '{perfil}': {r['pods']} pods ({r['con_precio']} con precio), "
+                    f"memoria {r['memoria_mb']:.0f} MB ({r['fuente']}), CPU {r['cpu_s']:.1f}s")
+
+    elegido = "completo"
+    ref = resultados.get("completo")
+    if ref and ref["pods"] > 0:
+        for perfil in ORDEN_COSTO_RENDER:
+            r = resultados.get(perfil)
+            if r and r["pods"] >= ref["pods"] and r["con_precio"] >= ref["con_precio"]:
+                elegido = perfil
+                break
+
+    perfiles = cargar_perfiles_render()
+    perfiles[nombre] = {"perfil": elegido, "mediciones": resultados, "fecha": datetime.now().isoformat()}
+    tmp = config.PERFILES_RENDER_JSON + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(perfiles, f, ensure_ascii=False, indent=4)
+    os.replace(tmp, config.PERFILES_RENDER_JSON)
+    LOGGER.info(f"[{nombre}] Perfil de render elegido: {elegido}")
+    return elegido
+
+
+def perfil_para_categoria(supervisor: SupervisorDriver, nombre: str, url: str) -> str:
+    """Perfil a usar según RENDER_PROFILE; en "auto" usa la calibración guardada o calibra ahora."""
+    if config.RENDER_PROFILE != "auto":
+        return config.RENDER_PROFILE
+    previo = (cargar_perfiles_render().get(nombre) or {}).get("perfil")
+    if previo in PERFILES_RENDER:
+        return previo
+    return calibrar_perfil_render(supervisor, nombre, url)
+
+
+_AVISO_SIN_RSS = False
+
+
+def controlar_presupuesto_pagina(supervisor: SupervisorDriver, categoria: str, pagina: int) -> bool:
+    """
+    Registra memoria/CPU tras la página y recicla el navegador si supera MAX_RSS_MB_POR_PAGINA
+    (solo con RSS real, es decir con psutil) o MAX_CPU_S_POR_PAGINA (CPU gastada en esta página).
+    Devuelve True si hubo reciclaje (el llamador debe volver a entrar por URL).
+    """
+    global _AVISO_SIN_RSS
+    try:
+        r = supervisor.ejecutar(medir_recursos, timeout=20)
+    except Exception:
+        return False
+    if not r:
+        return False
+    cpu_total = r.get("cpu_s", 0.0)
+    cpu_pagina = cpu_total - supervisor.cpu_previo if cpu_total >= supervisor.cpu_previo else cpu_total
+    supervisor.cpu_previo = cpu_total
+    if "rss_mb" in r:
+        memoria = f"RSS {r['rss_mb']:.0f} MB"
+    else:
+        memoria = f"heap JS {r.get('heap_js_mb', 0.0):.0f} MB"
+    LOGGER.info(f"[{categoria}] Página {pagina} [{supervisor.perfil}]: {memoria}, CPU página {cpu_pagina:.1f}s")
+
+    if config.MAX_RSS_MB_POR_PAGINA:
+        if "rss_mb" not in r:
+            if not _AVISO_SIN_RSS:
+                LOGGER.warning("--max-rss-mb requiere psutil (sin él solo hay heap JS vía CDP); no se aplica.")
+                _AVISO_SIN_RSS = True
+        elif r["rss_mb"] > config.MAX_RSS_MB_POR_PAGINA:
+            supervisor.reiniciar(f"RSS {r['rss_mb']:.0f} MB > {config.MAX_RSS_MB_POR_PAGINA:.0f} MB")
+            return True
+    if config.MAX_CPU_S_POR_PAGINA and cpu_pagina > config.MAX_CPU_S_POR_PAGINA:
+        supervisor.reiniciar(f"CPU {cpu_pagina:.1f}s > {config.MAX_CPU_S_POR_PAGINA:.1f}s en la página")
+        return True
+    return False
+
+
+# =========================
+# EXTRACCIÓN POR CATEGORÍA
+# =========================
+def cargar_listado(driver, url: str) -> str:
+    safe_get(driver, url)
+    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    nap(1.0, 1.6) if config.FAST_MODE else nap(1.2, 2.0)
+    return obtener_nombre_categoria(driver)
+
+
+def extraer_categoria(
+    supervisor: SupervisorDriver,
+    url_categoria: str,
+    nombre_categoria: Optional[str] = None,
+    limit_one_page: bool = False,
+    max_pages: Optional[int] = None,  # límite de páginas
+    estado: Optional[Dict[str, object]] = None
+) -> List[Producto]:
+    """
+    Recorre las páginas de la categoría. Cada carga/extracción/paginación corre bajo el watchdog
+    del supervisor; si una unidad se cuelga o el navegador muere, se reintenta la misma página
+    entrando directo por ?page=N. Con más de MAX_FALLOS_CATEGORIA fallos se abandona la categoría.
+    Si se pasa 'estado', se deja en estado["completa"] si el recorrido terminó (no se abandonó) y en
+    estado["huella"] la huella de la página 1, leída al cargarla (sin una carga extra).
+    """
+    # El nombre que se guarda dentro del objeto es el detectado en la página
+    # (pero los archivos de salida ya usan la clave con set_run_outputs)
+    categoria_nombre = nombre_categoria or "N/A"
+    nombre_detectado = False
+
+    productos_totales: List[Producto] = []
+    vistos: Set[str] = set()
+    pagina = 1
+    fallos = 0
+    # Hay que entrar a la página por URL: al inicio (la primera carga usa el mismo camino de
+    # fallo/reintento que el resto) y tras cada reinicio
+    recargar = True
+    completa = False
+
+    while True:
+        parciales: List[Producto] = []
+        try:
+            if recargar:
+                nombre = supervisor.ejecutar(
+                    cargar_listado, url_pagina(url_categoria, pagina), timeout=config.WATCHDOG_NAVEGACION_S
+                )
+                recargar = False
+                if not nombre_detectado:
+                    categoria_nombre = nombre or categoria_nombre
+                    nombre_detectado = True
+                    LOGGER.info(f"==> Categoria: {categoria_nombre} | {url_categoria}")
+                if pagina == 1 and estado is not None and estado.get("huella") is None:
+                    try:
+                        estado["huella"] = supervisor.ejecutar(leer_huella_listado, timeout=config.WATCHDOG_NAVEGACION_S)
+                    except Exception as e:
+                        # Navegador colgado/caído: el supervisor ya lo reinició, se reintenta la página
+                        if isinstance(e, WatchdogTimeout) or _sesion_muerta(e):
+                            raise
+                        LOGGER.warning(f"[{categoria_nombre}] No se pudo tomar la huella del listado: {e}")
+            supervisor.ejecutar(
+                extraer_productos_pagina,
+                contador_inicio=len(vistos) + 1,
+                pagina_actual=pagina,
+                categoria_actual=categoria_nombre,
+                obtener_detalles=(not config.FAST_MODE),
+                vistos_links=vistos,
+                destino=parciales,
+                timeout=config.WATCHDOG_PAGINA_S
+            )
+        except Exception as e:
+            productos_totales.extend(parciales)
+            fallos += 1
+            recargar = True
+            if fallos > config.MAX_FALLOS_CATEGORIA:
+                LOGGER.warning(f"[{categoria_nombre}] Presupuesto de fallos agotado ({fallos}). Se abandona en página {pagina}.")
+                break
+            LOGGER.warning(f"[{categoria_nombre}] Fallo {fallos}/{config.MAX_FALLOS_CATEGORIA} en página {pagina}: {e}. Reencolando.")
+            supervisor.verificar()
+            continue
+
+        if not parciales:
+            if pagina == 1 and supervisor.perfil != "completo":
+                LOGGER.warning(f"[{categoria_nombre}] Perfil '{supervisor.perfil}' sin productos; se reintenta con 'completo'.")
+                supervisor.cambiar_perfil("completo")
+                recargar = True
+                continue
+            LOGGER.info(f"[{categoria_nombre}] No hay nuevos productos en esta página. Fin.")
+            completa = True
+            break
+
+        productos_totales.extend(parciales)
+        reciclado = controlar_presupuesto_pagina(supervisor, categoria_nombre, pagina)
+
+        # 1) Si está activado el modo 1 página
+        if limit_one_page:
+            LOGGER.info(f"[{categoria_nombre}] Modo 1 página por categoría: detenido en página {pagina}.")
+            completa = True
+            break
+
+        # 2) Si el usuario indicó máximo de páginas
+        if max_pages is not None and pagina >= max_pages:
+            LOGGER.info(f"[{categoria_nombre}] Alcanzado límite de {max_pages} páginas. Detenido en página {pagina}.")
+            completa = True
+            break
+
+        # 3) Intentar pasar a la siguiente página (si se recicló el navegador, se entra directo por URL)
+        try:
+            if reciclado:
+                hay_siguiente, recargar = True, True
+            else:
+                hay_siguiente = supervisor.ejecutar(ir_a_siguiente_pagina, timeout=config.WATCHDOG_NAVEGACION_S)
+        except Exception as e:
+            # Colgada (WatchdogTimeout) o navegador caído (el supervisor ya lo reinició)
+            fallos += 1
+            LOGGER.warning(f"[{categoria_nombre}] Paginación falló ({e}); se entra directo a la página {pagina + 1}.")
+            hay_siguiente, recargar = True, True
+            if fallos > config.MAX_FALLOS_CATEGORIA:
+                LOGGER.warning(f"[{categoria_nombre}] Presupuesto de fallos agotado ({fallos}). Se abandona en página {pagina}.")
+                break
+        if not hay_siguiente:
+            LOGGER.info(f"[{categoria_nombre}] No hay más páginas.")
+            completa = True
+            break
+
+        pagina += 1
+        nap(0.6, 1.2) if config.FAST_MODE else nap(1.0, 2.0)
+
+    if estado is not None:
+        estado["completa"] = completa
+    return productos_totales
+
+
+# =========================
+# HUELLA DEL LISTADO (--changed-only)
+# =========================
+def huella_listado(driver, url_categoria: str) -> Optional[Tuple[str, int]]:
+    """
+    Carga SOLO la primera página del listado (sin scroll completo ni fichas) y devuelve
+    (huella, cantidad_de_pods). Es la carga liviana de --changed-only para decidir si se omite.
+    """
+    safe_get(driver, url_categoria)
+    return leer_huella_listado(driver)
+
+
+def leer_huella_listado(driver) -> Optional[Tuple[str, int]]:
+    """
+    Huella de la página de listado ya cargada, antes del scroll (así coincide con la de huella_listado
+    aunque se tome dentro del crawl). Los hrefs y precios se leen con un único execute_script.
+    """
+    sitio = get_sitio()
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, sitio.sel_pods))
+        )
+    except TimeoutException:
+        return None
+    crudos = driver.execute_script("""
+        const pods = document.querySelectorAll(arguments[2]);
+        const sels = arguments[0], aguja = arguments[1];
+        return Array.from(pods).map(p => {
+            for (const sel of sels) {
+                for (const el of p.querySelectorAll(sel)) {
+                    if (el.getClientRects().length && (el.innerText || '').includes(aguja)) return [p.getAttribute('href') || '', el.innerText];
+                }
+            }
+            return [p.getAttribute('href') || '', ''];
+        });
+    """, get_selectores().orden("precio"), sitio.aguja_precio, sitio.sel_pods) or []
+    items = [(sitio.extraer_product_id(href) or href.split("?")[0], precio) for href, precio in crudos if href]
+    if not items:
+        return None
+    return calcular_huella(items), len(items)
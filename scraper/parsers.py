@@ -0,0 +1,72 @@
+# scraper/parsers.py
+# Parseos puros de texto comunes a todos los sitios (precio, marca, tamaño). Sin navegador.
+import re
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+
+def slugify(txt: str) -> str:
+    """Convierte un nombre en un slug simple para archivos."""
+    t = txt.strip().lower()
+    t = re.sub(r"\s+", "_", t)
+    t = re.sub(r"[^\w\-]+", "", t)  # deja letras/números/guion_bajo/guion
+    return t or "salida"
+
+
+# =========================
+# UTILIDADES / PARSEOS
+# =========================
+def limpiar_precio(precio_raw: str) -> Tuple[str, Optional[int], Optional[str]]:
+    if not precio_raw or precio_raw == "N/A":
+        return ("N/A", None, None)
+    m = re.search(r"(\$)\s*([\d\.\,]+)", precio_raw)
+    if not m:
+        return ("N/A", None, None)
+    simbolo, cifra = m.group(1), m.group(2)
+    valor = int(re.sub(r"[^\d]", "", cifra)) if re.search(r"\d", cifra) else None
+    return (f"{simbolo} {cifra}", valor, "COP")
+
+
+def formatear_calificacion(valor) -> str:
+    """
+    Formato único de 'calificacion' (listado, ficha y API): el número tal cual, hasta 4 decimales
+    y sin ceros de más ("4.6705", "4.5", "5"); "N/A" si no hay rating.
+    """
+    try:
+        num = float(str(valor).strip().replace(",", "."))
+    except (TypeError, ValueError):
+        return "N/A"
+    if num <= 0:
+        return "N/A"
+    return f"{round(num, 4):g}"
+
+
+def extraer_tamano_desde_titulo(titulo: str) -> str:
+    m = re.search(r'(\d{2,3})\s*(?:["”]|pulgadas?|in\b)', titulo, re.I)
+    return (m.group(1) + '"') if m else "N/A"
+
+
+def parsear_marca_desde_titulo(titulo: str) -> str:
+    partes = re.split(r"\s+|-|–|—", titulo)
+    for p in partes:
+        w = re.sub(r"[^A-Za-zÁÉÍÓÚÜÑáéíóúüñ0-9]", "", p)
+        if w and w.lower() not in {"tv", "smart", "led", "uhd", "4k", "full", "hd", "de", "para", "por"} and len(w) >= 2:
+            return w.upper()
+    return "N/A"
+
+
+def derivar_nombre_desde_url(href: str) -> str:
+    try:
+        path = urlparse(href).path
+        parts = [p for p in path.split("/") if p]
+        if "category" in parts:
+            i = parts.index("category")
+            if i + 1 < len(parts):
+                raw = parts[i + 1]
+                return re.sub(r"[-_]+", " ", raw).strip().title()
+        if parts:
+            raw = parts[-1]
+            return re.sub(r"[-_]+", " ", raw).strip().title()
+    except Exception:
+        pass
+    return ""
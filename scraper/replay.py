@@ -0,0 +1,119 @@
+# scraper/replay.py
+# Reprocesamiento desde snapshots (--replay), un proceso por categoría.
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from scraper import config
+from scraper import salidas
+from scraper.config import LOGGER
+from scraper.detalles import cerrar_detalle_fetcher
+from scraper.salidas import Producto, guardar_json, set_run_outputs
+from scraper.snapshots import SnapshotStore, get_snapshots
+
+
+# =========================
+# REPLAY DESDE SNAPSHOTS
+# =========================
+def _rango_corrida(marca: Optional[dict], corrida: str) -> Tuple[int, float, bool, str]:
+    """
+    Orden de preferencia de una corrida para el replay: terminada (marca "crawl" completa), con más
+    páginas pedidas (sin límite = todas), con detalles de ficha, y por último la más reciente.
+    """
+    if not marca or not marca.get("completa"):
+        return 0, 0.0, False, corrida
+    alcance = marca.get("alcance") or {}
+    paginas = alcance.get("paginas")
+    return 1, float("inf") if paginas is None else float(paginas), bool(alcance.get("detalles")), corrida
+
+
+def _planificar_replay(store: SnapshotStore, claves: Optional[List[str]] = None) -> Dict[str, List[dict]]:
+    """
+    Por clave de categoría: páginas de listado (última versión por página) de la corrida preferida
+    según _rango_corrida. Un crawl con --pages/--one-page o abandonado no reemplaza a uno completo.
+    """
+    por_clave: Dict[str, Dict[str, Dict[int, dict]]] = {}
+    marcas: Dict[Tuple[str, str], dict] = {}
+    for e in store.indice():
+        if e.get("tipo") == "crawl":
+            marcas[(e.get("clave"), e.get("corrida", ""))] = e
+            continue
+        if e.get("tipo") != "listado" or e.get("sufijo", "formatted") != "formatted":
+            continue
+        clave = e.get("clave")
+        if not clave or (claves and clave not in claves):
+            continue
+        por_clave.setdefault(clave, {}).setdefault(e.get("corrida", ""), {})[int(e.get("pagina", 1))] = e
+    plan: Dict[str, List[dict]] = {}
+    for clave, corridas in por_clave.items():
+        elegida = max(corridas, key=lambda c: _rango_corrida(marcas.get((clave, c)), c))
+        if _rango_corrida(marcas.get((clave, elegida)), elegida)[0] == 0:
+            LOGGER.warning(f"[{clave}] Ningún crawl terminado en los snapshots; se usa la corrida más reciente ({elegida}).")
+        plan[clave] = [corridas[elegida][p] for p in sorted(corridas[elegida])]
+    return plan
+
+
+def _replay_categoria(clave: str, paginas: List[dict], opciones: dict) -> Tuple[str, int]:
+    """Worker (un proceso por categoría): reprocesa las páginas del snapshot con el pipeline normal."""
+    # Selenium se importa aquí, en el worker: el proceso principal solo planifica
+    from scraper import navegador
+
+    config.usar_sitio(opciones["sitio"])
+    config.SNAPSHOT_DIR = opciones["snapshot_dir"]
+    config.REPLAY_MODE = True
+    # El plan toma todas las páginas de una misma corrida: API y fichas se buscan solo en ella
+    config.REPLAY_CORRIDA = paginas[0].get("corrida") if paginas else None
+    config.FAST_MODE = opciones["fast"]
+    config.USE_DETAIL_API = True
+    navegador.reiniciar_contador_extraccion()
+    store = get_snapshots()
+
+    driver = navegador.crear_driver("replay")
+    try:
+        set_run_outputs(clave)
+        vistos: Set[str] = set()
+        productos_cat: List[Producto] = []
+        for e in paginas:
+            navegador.fijar_fecha_extraccion(e.get("fecha"))
+            driver.get("file://" + store.archivo_local(e["sha"], e.get("formato", "html")))
+            productos, _ = navegador.extraer_productos_pagina(
+                driver,
+                contador_inicio=len(vistos) + 1,
+                pagina_actual=int(e.get("pagina", 1)),
+                categoria_actual=e.get("categoria") or clave,
+                obtener_detalles=bool(e.get("detalles", False)),
+                vistos_links=vistos
+            )
+            productos_cat.extend(productos)
+        guardar_json(productos_cat, salidas.RUN_JSON)
+        return clave, len(productos_cat)
+    finally:
+        driver.quit()
+        cerrar_detalle_fetcher()
+
+
+def ejecutar_replay(claves: Optional[List[str]] = None, workers: Optional[int] = None) -> None:
+    """
+    Regenera {clave}_formatted.json/.jsonl desde los snapshots, sin red, con un proceso por categoría.
+    """
+    store = get_snapshots()
+    if store is None:
+        raise SystemExit("❌ --replay necesita un directorio de snapshots (--snapshots DIR).")
+    plan = _planificar_replay(store, claves)
+    if not plan:
+        LOGGER.warning(f"No hay snapshots de listados en {store.raiz}.")
+        return
+    workers = workers or min(len(plan), os.cpu_count() or 1)
+    opciones = {"sitio": config.SITIO, "snapshot_dir": store.raiz, "fast": config.FAST_MODE}
+    LOGGER.info(f"⏪ Replay de {len(plan)} categorías ({sum(len(v) for v in plan.values())} páginas) con {workers} procesos.")
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = [pool.submit(_replay_categoria, clave, paginas, opciones) for clave, paginas in plan.items()]
+        for fut in futuros:
+            try:
+                clave, n = fut.result()
+                LOGGER.info(f"[{clave}] Replay: {n} productos.")
+            except Exception as e:
+                LOGGER.warning(f"Error en replay: {e}")
+    LOGGER.info(f"✅ Replay finalizado en {time.time() - t0:.1f}s.")
@@ -0,0 +1,239 @@
+# scraper/salidas.py
+# Modelo Producto, persistencia JSON/JSONL y resúmenes incrementales por categoría.
+import json
+import re
+import os
+import os.path as osp
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from datetime import datetime
+
+from scraper import config
+from scraper.config import LOGGER
+from scraper.parsers import slugify
+
+
+# Rutas activas de salida (se actualizan por corrida)
+RUN_JSON = config.OUTPUT_JSON
+RUN_JSONL = config.OUTPUT_JSONL
+RUN_CLAVE = "all"
+RUN_SUFIJO = "formatted"
+
+
+def set_run_outputs(nombre_categoria: str, sufijo: str = "formatted", reiniciar: bool = True) -> None:
+    """
+    Define archivos por corrida/categoría usando la CLAVE de EXPECTED_URLS (o el nombre pasado por CLI).
+    Se crean/l limpian:
+    - {slug}_{sufijo}.json
+    - {slug}_{sufijo}.jsonl
+    Con reiniciar=False no se truncan (p.ej. refrescos programados que se acumulan).
+    """
+    global RUN_JSON, RUN_JSONL, RUN_CLAVE, RUN_SUFIJO
+    RUN_CLAVE, RUN_SUFIJO = nombre_categoria, sufijo
+    slug = slugify(nombre_categoria)
+    RUN_JSON = osp.join(config.OUT_DIR, f"{slug}_{sufijo}.json")
+    RUN_JSONL = osp.join(config.OUT_DIR, f"{slug}_{sufijo}.jsonl")
+
+    os.makedirs(config.OUT_DIR, exist_ok=True)
+    # Reinicia los archivos al iniciar un nuevo scrape de esta categoría
+    if reiniciar:
+        with open(RUN_JSON, "w", encoding="utf-8") as f:
+            f.write("[]")
+        with open(RUN_JSONL, "w", encoding="utf-8") as _:
+            pass
+    iniciar_resumen(RUN_JSONL, reiniciar)
+
+    LOGGER.info(f"🗂️ Salidas para '{nombre_categoria}':")
+    LOGGER.info(f"   JSON  : {RUN_JSON}")
+    LOGGER.info(f"   JSONL : {RUN_JSONL}")
+
+
+# =========================
+# MODELO DE DATO
+# =========================
+@dataclass
+class Producto:
+    contador_extraccion_total: int
+    contador_extraccion: int
+    titulo: str
+    marca: str
+    precio_texto: str
+    precio_valor: Optional[int]
+    moneda: Optional[str]
+    tamaño: str
+    calificacion: str
+    detalles_adicionales: str
+    fuente: str
+    categoria: str
+    imagen: str
+    link: str
+    pagina: int
+    fecha_extraccion: str
+    extraction_status: str
+
+
+# =========================
+# PERSISTENCIA (usa RUN_JSON / RUN_JSONL)
+# =========================
+def guardar_json(productos: List[Producto], ruta: Optional[str] = None):
+    ruta = ruta or RUN_JSON
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump([asdict(p) for p in productos], f, ensure_ascii=False, indent=4)
+    guardar_resumen()
+
+
+def append_jsonl(producto: Producto, ruta: Optional[str] = None):
+    ruta = ruta or RUN_JSONL
+    registro = asdict(producto)
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    if _RESUMEN_ACTUAL is not None and _RESUMEN_ACTUAL.ruta_jsonl == ruta:
+        _RESUMEN_ACTUAL.agregar(registro)
+
+
+# =========================
+# RESÚMENES POR CATEGORÍA (agregados incrementales para 'stats')
+# =========================
+def _cuantil(ordenados: List[int], q: float) -> Optional[float]:
+    """Cuantil con interpolación lineal sobre una lista ya ordenada."""
+    if not ordenados:
+        return None
+    pos = (len(ordenados) - 1) * q
+    i = int(pos)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (pos - i)
+
+
+def _resumen_precios(precios: List[int]) -> dict:
+    ordenados = sorted(precios)
+    return {
+        "n": len(ordenados),
+        "min": ordenados[0] if ordenados else None,
+        "max": ordenados[-1] if ordenados else None,
+        "cuantiles": {f"p{int(q * 100)}": _cuantil(ordenados, q) for q in ResumenCategoria.CUANTILES},
+    }
+
+
+class ResumenCategoria:
+    """
+    Agregados de un archivo {slug}_{sufijo}.jsonl que se mantienen producto a producto mientras se
+    escribe (ver append_jsonl) y se guardan en {slug}_{sufijo}.summary.json. El resumen recuerda el
+    tamaño del JSONL que resume; si no coincide, 'stats' lo recalcula recorriendo el JSONL.
+    """
+
+    CUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    def __init__(self, ruta_jsonl: str):
+        self.ruta_jsonl = ruta_jsonl
+        self.total = 0
+        self.status: Dict[str, int] = {}
+        self.tamanos: Dict[str, int] = {}
+        self.categorias: Dict[str, int] = {}
+        self.precios: List[int] = []
+        self.precios_marca: Dict[str, List[int]] = {}
+        self.marcas: Dict[str, int] = {}
+
+    @property
+    def ruta_resumen(self) -> str:
+        return re.sub(r"\.jsonl$", "", self.ruta_jsonl) + ".summary.json"
+
+    def agregar(self, p: dict) -> None:
+        self.total += 1
+        st = p.get("extraction_status") or "N/A"
+        self.status[st] = self.status.get(st, 0) + 1
+        tam = p.get("tamaño") or "N/A"
+        self.tamanos[tam] = self.tamanos.get(tam, 0) + 1
+        cat = p.get("categoria") or "N/A"
+        self.categorias[cat] = self.categorias.get(cat, 0) + 1
+        marca = p.get("marca") or "N/A"
+        self.marcas[marca] = self.marcas.get(marca, 0) + 1
+        precio = p.get("precio_valor")
+        if isinstance(precio, int):
+            self.precios.append(precio)
+            self.precios_marca.setdefault(marca, []).append(precio)
+
+    @classmethod
+    def desde_jsonl(cls, ruta_jsonl: str) -> "ResumenCategoria":
+        r = cls(ruta_jsonl)
+        try:
+            with open(ruta_jsonl, "r", encoding="utf-8") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    try:
+                        r.agregar(json.loads(linea))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return r
+
+    def a_dict(self) -> dict:
+        try:
+            bytes_jsonl = osp.getsize(self.ruta_jsonl)
+        except OSError:
+            bytes_jsonl = None
+        return {
+            "archivo": osp.basename(self.ruta_jsonl),
+            "bytes_jsonl": bytes_jsonl,
+            "actualizado": datetime.now().isoformat(),
+            "total": self.total,
+            "extraction_status": {
+                k: {"n": v, "ratio": round(v / self.total, 4) if self.total else 0.0}
+                for k, v in sorted(self.status.items())
+            },
+            "categorias": dict(sorted(self.categorias.items(), key=lambda kv: -kv[1])),
+            "precio": _resumen_precios(self.precios),
+            "marcas": {
+                m: {"n": n, "precio": _resumen_precios(self.precios_marca.get(m, []))}
+                for m, n in sorted(self.marcas.items(), key=lambda kv: -kv[1])
+            },
+            "tamanos": dict(sorted(self.tamanos.items(), key=lambda kv: -kv[1])),
+        }
+
+    def guardar(self) -> dict:
+        data = self.a_dict()
+        tmp = self.ruta_resumen + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.ruta_resumen)
+        return data
+
+
+_RESUMEN_ACTUAL: Optional[ResumenCategoria] = None
+
+
+def iniciar_resumen(ruta_jsonl: str, reiniciar: bool) -> None:
+    """Resumen en memoria para el JSONL activo; si el archivo no se truncó, se reconstruye desde él."""
+    global _RESUMEN_ACTUAL
+    if not reiniciar and _RESUMEN_ACTUAL is not None and _RESUMEN_ACTUAL.ruta_jsonl == ruta_jsonl:
+        return
+    _RESUMEN_ACTUAL = ResumenCategoria(ruta_jsonl) if reiniciar else ResumenCategoria.desde_jsonl(ruta_jsonl)
+
+
+def guardar_resumen() -> None:
+    if _RESUMEN_ACTUAL is None:
+        return
+    try:
+        _RESUMEN_ACTUAL.guardar()
+    except OSError as e:
+        LOGGER.warning(f"No se pudo guardar el resumen {_RESUMEN_ACTUAL.ruta_resumen}: {e}")
+
+
+def cargar_resumen(ruta_jsonl: str, recalcular: bool = False) -> dict:
+    """Resumen precomputado si está al día con el JSONL; si no, recorre el JSONL y lo regenera."""
+    ruta_resumen = re.sub(r"\.jsonl$", "", ruta_jsonl) + ".summary.json"
+    if not recalcular:
+        try:
+            with open(ruta_resumen, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("bytes_jsonl") == osp.getsize(ruta_jsonl):
+                return data
+        except (OSError, ValueError):
+            pass
+    resumen = ResumenCategoria.desde_jsonl(ruta_jsonl)
+    try:
+        return resumen.guardar()
+    except OSError:
+        return resumen.a_dict()
@@ -0,0 +1,143 @@
+# scraper/selectores.py
+# Perfil de selectores CSS (selectores.json) con orden adaptativo y contadores de aciertos.
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Union
+
+from scraper import config
+from scraper.config import LOGGER
+from scraper.sitios import get_sitio
+
+
+# =========================
+# PERFIL DE SELECTORES (config + orden adaptativo)
+# =========================
+# Prueba los selectores en orden dentro del navegador (un solo round-trip) y devuelve
+# [indice_del_selector, texto] del primer elemento con texto visible (que contenga 'aguja' si se indica).
+# Como el .text de Selenium: los elementos sin cajas renderizadas (display:none propio o de un
+# ancestro) se saltan, porque su innerText devuelve igual el texto completo.
+JS_PRIMER_TEXTO = """
+const raiz = arguments[0] || document, sels = arguments[1], aguja = arguments[2];
+for (let i = 0; i < sels.length; i++) {
+    for (const el of raiz.querySelectorAll(sels[i])) {
+        if (!el.getClientRects().length) continue;
+        const t = (el.innerText || '').trim();
+        if (t && (!aguja || t.includes(aguja))) return [i, t];
+    }
+}
+return [-1, ''];
+"""
+
+
+def _niveles(sels: List[Union[str, List[str]]]) -> List[List[str]]:
+    """Normaliza un grupo a niveles: un selector suelto es un nivel propio; una lista, un nivel de equivalentes."""
+    niveles = []
+    for x in sels:
+        nivel = [str(s) for s in x] if isinstance(x, list) else [str(x)]
+        if nivel:
+            niveles.append(nivel)
+    return niveles
+
+
+class PerfilSelectores:
+    """
+    Grupos de selectores CSS cargados desde un JSON ({grupo: [nivel, ...]}); los que falten
+    salen de SiteAdapter.selectores_por_defecto del sitio activo.
+    Los niveles son prioridades semánticas y se prueban siempre en el orden del archivo; dentro de
+    un nivel (lista de selectores equivalentes) se prueba primero el que más acierta.
+    Las estadísticas se exportan a SELECTORES_STATS_JSON y se usan para sembrar el orden de la próxima corrida.
+    """
+
+    def __init__(self, ruta: Optional[str] = None, ruta_stats: Optional[str] = None):
+        sitio = get_sitio()
+        self.ruta = ruta or config.SELECTORES_JSON or sitio.selectores_json
+        self.ruta_stats = ruta_stats or config.SELECTORES_STATS_JSON
+        self.niveles: Dict[str, List[List[str]]] = {
+            k: _niveles(v) for k, v in sitio.selectores_por_defecto.items()
+        }
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                for grupo, sels in json.load(f).items():
+                    if isinstance(sels, list) and sels:
+                        self.niveles[grupo] = _niveles(sels)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"No se pudo leer {self.ruta}; se usan selectores por defecto: {e}")
+        self.grupos: Dict[str, List[str]] = {g: [s for nivel in v for s in nivel] for g, v in self.niveles.items()}
+        self.aciertos: Dict[str, Dict[str, int]] = {g: {sel: 0 for sel in v} for g, v in self.grupos.items()}
+        self.fallos: Dict[str, Dict[str, int]] = {g: {sel: 0 for sel in v} for g, v in self.grupos.items()}
+        self._sembrar()
+        self._lock = threading.Lock()
+
+    def _sembrar(self) -> None:
+        try:
+            with open(self.ruta_stats, "r", encoding="utf-8") as f:
+                previas = json.load(f)
+        except (OSError, ValueError):
+            return
+        for grupo, sels in previas.items():
+            for sel, st in (sels or {}).items():
+                if sel in self.aciertos.get(grupo, {}):
+                    self.aciertos[grupo][sel] = int(st.get("aciertos", 0))
+                    self.fallos[grupo][sel] = int(st.get("fallos", 0))
+
+    def orden(self, grupo: str) -> List[str]:
+        hits = self.aciertos.get(grupo, {})
+        orden: List[str] = []
+        for nivel in self.niveles.get(grupo, []):
+            orden.extend(sorted(nivel, key=lambda sel: (-hits.get(sel, 0), nivel.index(sel))))
+        return orden
+
+    def registrar(self, grupo: str, probados: List[str], idx_acierto: int) -> None:
+        """'probados' en el orden usado; los anteriores al acierto cuentan como fallo (idx -1 = ninguno acertó)."""
+        with self._lock:
+            fin = idx_acierto if idx_acierto >= 0 else len(probados)
+            for sel in probados[:fin]:
+                self.fallos[grupo][sel] = self.fallos[grupo].get(sel, 0) + 1
+            if idx_acierto >= 0:
+                sel = probados[idx_acierto]
+                self.aciertos[grupo][sel] = self.aciertos[grupo].get(sel, 0) + 1
+
+    def primer_texto(self, raiz, grupo: str, aguja: Optional[str] = None, driver=None) -> Optional[str]:
+        """Texto del primer selector del grupo que encuentra algo dentro de 'raiz' (WebElement o None=documento)."""
+        sels = self.orden(grupo)
+        driver = driver or raiz.parent
+        idx, texto = driver.execute_script(JS_PRIMER_TEXTO, raiz, sels, aguja)
+        self.registrar(grupo, sels, idx)
+        return texto if idx >= 0 else None
+
+    def estadisticas(self) -> Dict[str, Dict[str, dict]]:
+        return {
+            g: {
+                sel: {"aciertos": self.aciertos[g].get(sel, 0), "fallos": self.fallos[g].get(sel, 0)}
+                for sel in self.orden(g)
+            }
+            for g in self.grupos
+        }
+
+    def exportar(self) -> None:
+        tmp = self.ruta_stats + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.estadisticas(), f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.ruta_stats)
+
+
+_SELECTORES: Optional[PerfilSelectores] = None
+
+
+def get_selectores() -> PerfilSelectores:
+    global _SELECTORES
+    if _SELECTORES is None:
+        _SELECTORES = PerfilSelectores()
+    return _SELECTORES
+
+
+def exportar_selectores() -> None:
+    if _SELECTORES is not None:
+        try:
+            _SELECTORES.exportar()
+            LOGGER.info(f"📊 Estadísticas de selectores: {_SELECTORES.ruta_stats}")
+        except OSError as e:
+            LOGGER.warning(f"No se pudieron exportar las estadísticas de selectores: {e}")
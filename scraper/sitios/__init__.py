@@ -0,0 +1,36 @@
+# scraper/sitios/__init__.py
+# Registro de adaptadores de sitio (--sitio). Se importan bajo demanda.
+import importlib
+from typing import Dict, List, Optional
+
+from scraper import config
+from scraper.sitios.base import SiteAdapter
+
+
+# nombre -> "modulo:Clase"
+ADAPTADORES: Dict[str, str] = {
+    "falabella": "scraper.sitios.falabella:FalabellaAdapter",
+}
+
+_INSTANCIAS: Dict[str, SiteAdapter] = {}
+
+
+def registrar_adaptador(nombre: str, ruta: str) -> None:
+    """Agrega un adaptador ('modulo:Clase') sin tocar este archivo (p.ej. desde un plugin)."""
+    ADAPTADORES[nombre] = ruta
+    _INSTANCIAS.pop(nombre, None)
+
+
+def sitios_disponibles() -> List[str]:
+    return sorted(ADAPTADORES)
+
+
+def get_sitio(nombre: Optional[str] = None) -> SiteAdapter:
+    """Adaptador del sitio activo (config.SITIO) o del indicado."""
+    nombre = nombre or config.SITIO
+    if nombre not in _INSTANCIAS:
+        if nombre not in ADAPTADORES:
+            raise KeyError(f"Sitio desconocido '{nombre}'. Disponibles: {', '.join(sitios_disponibles())}")
+        modulo, clase = ADAPTADORES[nombre].split(":")
+        _INSTANCIAS[nombre] = getattr(importlib.import_module(modulo), clase)()
+    return _INSTANCIAS[nombre]
@@ -0,0 +1,146 @@
+# scraper/sitios/base.py
+# Contrato de un sitio (SiteAdapter): lo que depende del HTML, las URLs y la API de cada retailer.
+import re
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+from scraper.parsers import (
+    derivar_nombre_desde_url, extraer_tamano_desde_titulo, formatear_calificacion, limpiar_precio,
+    parsear_marca_desde_titulo
+)
+
+
+# =========================
+# INTERFAZ DE ADAPTADOR
+# =========================
+class SiteAdapter:
+    """
+    Todo lo específico de un retailer vive aquí; el runtime (navegador/supervisor, pausas,
+    reintentos, API en lote, snapshots, huellas, salidas y estadísticas) solo habla con esta interfaz.
+
+    Un adaptador nuevo hereda de esta clase, completa los atributos y sobreescribe los métodos
+    que no le sirvan, y se registra en scraper/sitios/__init__.py (ADAPTADORES).
+    Los métodos de parseo son Python puro (sin navegador), así se pueden medir contra fixtures
+    grabados con benchmarks/bench_adaptadores.py.
+    """
+
+    # Clave para --sitio; también nombra la carpeta de salidas (data/<nombre>, salvo el sitio por defecto)
+    nombre: str = ""
+    # Valor de Producto.fuente
+    fuente: str = ""
+    home_url: str = ""
+    # Categorías conocidas (clave -> URL del listado)
+    categorias: Dict[str, str] = {}
+
+    # Selectores CSS del listado y de la ficha
+    sel_listado: str = ""
+    sel_pod: str = ""
+    sel_imagen_pod: str = "img"
+    sel_calificacion_pod: str = "[data-rating]"
+    attr_calificacion_pod: Optional[str] = "data-rating"  # None = texto del elemento
+    sel_ficha: str = ""
+
+    # Rating en la ficha renderizada: XPath del elemento (aria-label o texto) y patrón del número (grupo 1)
+    xpath_calificacion_ficha: Optional[str] = None
+    calificacion_ficha_pat: Optional[re.Pattern] = None
+
+    # Grupos de selectores (titulo, precio, siguiente_pagina) y su archivo editable. Cada grupo es una
+    # lista de niveles en orden de prioridad; un nivel es un selector o una lista de selectores equivalentes
+    selectores_por_defecto: Dict[str, List[Union[str, List[str]]]] = {}
+    selectores_json: Optional[str] = None
+
+    # Parámetro de paginación del listado (?page=N)
+    param_pagina: str = "page"
+
+    # Texto que identifica el precio dentro del pod (moneda)
+    aguja_precio: str = "$"
+
+    # Cabeceras extra para la API de ficha
+    cabeceras_http: Dict[str, str] = {}
+
+    # Pods que no son productos (banners, "Envío gratis", ...) y sufijo del <title> a limpiar
+    titulos_descartados: Tuple[re.Pattern, ...] = ()
+    titulo_sufijo_pat: Optional[re.Pattern] = None
+
+    @property
+    def sel_pods(self) -> str:
+        """Selector de todos los pods de producto del listado."""
+        return f"{self.sel_listado} {self.sel_pod}".strip()
+
+    # ---- URLs ----
+    def url_pagina(self, url_categoria: str, pagina: int) -> str:
+        """Agrega/reemplaza el parámetro de página en la URL del listado (página 1 = URL original)."""
+        partes = urlparse(url_categoria)
+        query = [(k, v) for k, v in parse_qsl(partes.query) if k != self.param_pagina]
+        if pagina > 1:
+            query.append((self.param_pagina, str(pagina)))
+        return urlunparse(partes._replace(query=urlencode(query)))
+
+    def extraer_product_id(self, link: str) -> Optional[str]:
+        return None
+
+    def es_link_categoria(self, href: str) -> bool:
+        """Para descubrir_links_categorias: si un enlace de la home apunta a un listado."""
+        return False
+
+    def nombre_categoria_desde_url(self, url: str) -> str:
+        """Último recurso para nombrar un listado sin h1/breadcrumb/título ("" si no hay)."""
+        return derivar_nombre_desde_url(url)
+
+    # ---- API de ficha (None = sin API; se abre la ficha en el navegador) ----
+    def url_api_specs(self, product_id: str) -> Optional[str]:
+        return None
+
+    def url_api_rating(self, product_id: str) -> Optional[str]:
+        return None
+
+    def parsear_specs_api(self, data) -> str:
+        return ""
+
+    def parsear_rating_api(self, data) -> Optional[str]:
+        """Rating ("4.5" / "N/A" si no tiene), o None si la respuesta no trae el dato (se usa la ficha)."""
+        return None
+
+    def extraer_calificacion_texto(self, texto: str) -> str:
+        """Rating (formatear_calificacion) desde el aria-label/texto del elemento de xpath_calificacion_ficha."""
+        m = self.calificacion_ficha_pat.search(texto or "") if self.calificacion_ficha_pat else None
+        return formatear_calificacion(m.group(1)) if m else "N/A"
+
+    # ---- Parseo del listado ----
+    def limpiar_nombre_categoria(self, texto: str) -> str:
+        if self.titulo_sufijo_pat is not None:
+            texto = self.titulo_sufijo_pat.sub("", texto)
+        return texto.strip()
+
+    def titulo_descartado(self, titulo: str) -> bool:
+        if not titulo or titulo == "N/A":
+            return False
+        return any(pat.search(titulo) for pat in self.titulos_descartados)
+
+    def limpiar_precio(self, precio_raw: str) -> Tuple[str, Optional[int], Optional[str]]:
+        return limpiar_precio(precio_raw)
+
+    def parsear_marca(self, titulo: str) -> str:
+        return parsear_marca_desde_titulo(titulo) if titulo not in ("", "N/A") else "N/A"
+
+    def parsear_tamano(self, titulo: str) -> str:
+        return extraer_tamano_desde_titulo(titulo) if titulo not in ("", "N/A") else "N/A"
+
+    def parsear_item(self, crudo: dict) -> Optional[dict]:
+        """
+        Convierte lo leído de un pod ({link, titulo, imagen, precio_crudo, calificacion}) en los
+        campos del Producto, o None si el pod no es un producto.
+        """
+        titulo = crudo.get("titulo") or "N/A"
+        if self.titulo_descartado(titulo):
+            return None
+        precio_txt, precio_num, moneda = self.limpiar_precio(crudo.get("precio_crudo") or "")
+        return {
+            "link": crudo.get("link"),
+            "titulo": titulo,
+            "imagen": crudo.get("imagen") or "N/A",
+            "marca": self.parsear_marca(titulo),
+            "tamaño": self.parsear_tamano(titulo),
+            "precio": (precio_txt, precio_num, moneda),
+            "calificacion": formatear_calificacion(crudo.get("calificacion")),
+        }
@@ -0,0 +1,220 @@
+# scraper/sitios/falabella.py
+# Adaptador de falabella.com.co: categorías, selectores, paginación y API JSON de la ficha.
+import os
+import os.path as osp
+import re
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from scraper.parsers import formatear_calificacion
+from scraper.sitios.base import SiteAdapter
+
+
+# Diccionario estático de categorías (nombre -> URL)
+EXPECTED_URLS: Dict[str, str] = {
+    "televisores": "https://www.falabella.com.co/falabella-co/category/cat5420971/Smart-TV",
+    "celulares": "https://www.falabella.com.co/falabella-co/category/cat1660941/Celulares-y-Telefonos",
+    "domotica": "https://www.falabella.com.co/falabella-co/category/cat10431000/Smart-Home",
+    "lavado": "https://www.falabella.com.co/falabella-co/category/cat50714/Lavado",
+    "refrigeracion":"https://www.falabella.com.co/falabella-co/category/CATG32130/Refrigeracion",
+    "Cocina":"https://www.falabella.com.co/falabella-co/category/cat2970970/Cocina",
+    "audifonos":"https://www.falabella.com.co/falabella-co/category/cat50670/Audifonos",
+    "videojuegos":"https://www.falabella.com.co/falabella-co/category/cat50590/Gaming",
+    "deportes":"https://www.falabella.com.co/falabella-co/category/cat50620/Fitness-y-Gimnasio-en-casa",
+    "computadores": "https://www.falabella.com.co/falabella-co/category/cat171006/Computadores"
+
+}
+
+# Patrones para filtrar “pods” promocionales que no son productos reales
+PROMO_TITLE_PAT = re.compile(
+    r'^\s*(env[ií]o\s+gratis|por\s+falabella|vendid[oa]\s+por\s+falabella|exclusivo\s+falabella|marketplace\s+falabella)\b',
+    re.I
+)
+
+# Filtrar títulos tipo "Por X"
+TITLE_EXCLUDE_PAT = re.compile(r'^\s*por\b', re.I)
+
+# Valores por defecto si no existe selectores.json (mismo formato que el archivo: niveles en orden
+# de prioridad; una lista interna agrupa selectores equivalentes, los únicos que se reordenan)
+SELECTORES_POR_DEFECTO: Dict[str, List[Union[str, List[str]]]] = {
+    "titulo": [
+        ["[data-testid='product-title']", "[data-testid='name']"],
+        "h2, h3",
+        "p[class*='title'], span[class*='title']",
+    ],
+    "precio": [
+        ["[data-testid='current-price']", "span[data-testid*='current']"],
+        "[class*='price']",
+        "li[class*='price']",
+        "span",
+    ],
+    "siguiente_pagina": [
+        [
+            "button[id*='pagination'][id*='arrow-right']",
+            "button.btn.pagination-arrow",
+            "li[class*='pagination-arrow'] a, a[class*='pagination-arrow']",
+        ],
+        "a[rel='next'], button[aria-label*='Siguiente' i], a[aria-label*='Siguiente' i]",
+    ],
+}
+
+# Endpoints JSON que usa la propia ficha de producto. Se pueden sobreescribir por variables de entorno.
+DETAIL_API_SPECS_URL = os.getenv(
+    "FALABELLA_SPECS_API",
+    "https://www.falabella.com.co/s/browse/v3/product/co?productId={product_id}"
+)
+DETAIL_API_RATING_URL = os.getenv(
+    "FALABELLA_RATING_API",
+    "https://www.falabella.com.co/s/reviews/v1/product/co/summary?productId={product_id}"
+)
+
+
+# =========================
+# PARSEO DE LA API DE FICHA
+# =========================
+PRODUCT_ID_PAT = re.compile(r"/product/(\d+)")
+
+# Segmentos de URL que son ids de categoría (cat12345), no nombres
+CATEGORIA_ID_PAT = re.compile(r"cat\d+", re.I)
+
+
+def extraer_product_id(link: str) -> Optional[str]:
+    m = PRODUCT_ID_PAT.search(urlparse(link or "").path)
+    return m.group(1) if m else None
+
+
+# Ubicación de cada dato en las respuestas: rutas exactas de claves (sin buscar en todo el JSON,
+# para no tomar el rating o la descripción de un producto relacionado). Se verifican contra las
+# respuestas grabadas en fixtures/falabella/api/ con benchmarks/bench_adaptadores.py.
+RUTAS_SPECS: Tuple[Tuple[str, ...], ...] = (
+    ("data", "attributes", "specifications"),
+    ("productData", "attributes", "specifications"),
+)
+RUTAS_DESCRIPCION: Tuple[Tuple[str, ...], ...] = (
+    ("data", "longDescription"),
+    ("productData", "longDescription"),
+)
+RUTAS_RATING: Tuple[Tuple[str, ...], ...] = (
+    ("data", "averageOverallRating"),
+    ("reviewSummary", "primaryRating", "average"),
+)
+
+
+def _valor_en(data, rutas: Tuple[Tuple[str, ...], ...]):
+    """Primer valor presente (no None) en alguna de las rutas, en orden; None si ninguna existe."""
+    for ruta in rutas:
+        actual = data
+        for clave in ruta:
+            if not isinstance(actual, dict) or clave not in actual:
+                break
+            actual = actual[clave]
+        else:
+            if actual is not None:
+                return actual
+    return None
+
+
+def parsear_specs_api(data) -> str:
+    """
+    Convierte la respuesta de especificaciones en el mismo texto que produce #productInfoContainer:
+    'Especificaciones\n<nombre> <valor>\n...' (+ 'Información adicional' si viene la descripción).
+    """
+    specs = _valor_en(data, RUTAS_SPECS)
+    lineas: List[str] = []
+    if isinstance(specs, list):
+        for item in specs:
+            if not isinstance(item, dict):
+                continue
+            nombre = str(item.get("name") or item.get("label") or "").strip()
+            valor = item.get("value", item.get("values"))
+            if isinstance(valor, list):
+                valor = ", ".join(str(v) for v in valor)
+            valor = str(valor or "").strip()
+            if nombre or valor:
+                lineas.append(f"{nombre} {valor}".strip())
+    elif isinstance(specs, dict):
+        lineas = [f"{k} {v}".strip() for k, v in specs.items()]
+
+    texto = ""
+    if lineas:
+        texto = "Especificaciones\n" + "\n".join(lineas)
+    descripcion = _valor_en(data, RUTAS_DESCRIPCION)
+    if isinstance(descripcion, str) and descripcion.strip():
+        descripcion = re.sub(r"<[^>]+>", "\n", descripcion)
+        descripcion = re.sub(r"\n\s*\n+", "\n", descripcion).strip()
+        texto = (texto + "\n" if texto else "") + "Información adicional\n" + descripcion
+    return texto
+
+
+def parsear_rating_api(data) -> Optional[str]:
+    """Rating en el mismo formato que el listado (formatear_calificacion), None si la respuesta no lo trae."""
+    val = _valor_en(data, RUTAS_RATING)
+    if val is None:
+        return None
+    try:
+        float(str(val).replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+    return formatear_calificacion(val)
+
+
+# =========================
+# ADAPTADOR
+# =========================
+class FalabellaAdapter(SiteAdapter):
+    nombre = "falabella"
+    fuente = "Falabella"
+    home_url = "https://www.falabella.com.co/falabella-co/"
+    categorias = EXPECTED_URLS
+
+    sel_listado = "#testId-searchResults-products"
+    sel_pod = "a[data-pod='catalyst-pod']"
+    sel_imagen_pod = "img[id^='testId-pod-image']"
+    sel_ficha = "#productInfoContainer"
+    xpath_calificacion_ficha = "//*[@aria-label[contains(., 'de 5')]]"
+    calificacion_ficha_pat = re.compile(r"(\d+(?:[.,]\d+)?)\s*de\s*5", re.I)
+
+    selectores_por_defecto = SELECTORES_POR_DEFECTO
+    selectores_json = os.getenv(
+        "FALABELLA_SELECTORES",
+        osp.join(osp.dirname(osp.dirname(osp.dirname(osp.abspath(__file__)))), "selectores.json")
+    )
+
+    cabeceras_http = {"Accept-Language": "es-CO,es;q=0.9"}
+
+    titulos_descartados = (PROMO_TITLE_PAT, TITLE_EXCLUDE_PAT)
+    titulo_sufijo_pat = re.compile(r"\s*[\|\-–—]\s*Falabella.*$", re.I)
+
+    def extraer_product_id(self, link: str) -> Optional[str]:
+        return extraer_product_id(link)
+
+    def es_link_categoria(self, href: str) -> bool:
+        if "falabella.com.co/falabella-co" not in href:
+            return False
+        return "/category/" in href or ("/search?" in href and ("Ntt=" in href or "categoryId=" in href))
+
+    def nombre_categoria_desde_url(self, url: str) -> str:
+        """/category/cat5420971/Smart-TV -> 'Smart Tv' (salta los ids cat12345)."""
+        parts = [p for p in urlparse(url).path.split("/") if p]
+        candidatos = parts[-1:]
+        if "category" in parts:
+            idx = parts.index("category")
+            candidatos = parts[idx + 1:idx + 2] + candidatos
+        for raw in candidatos:
+            if not CATEGORIA_ID_PAT.fullmatch(raw):
+                nombre = re.sub(r"[-_]+", " ", raw).strip().title()
+                if nombre:
+                    return nombre
+        return ""
+
+    def url_api_specs(self, product_id: str) -> Optional[str]:
+        return DETAIL_API_SPECS_URL.format(product_id=product_id)
+
+    def url_api_rating(self, product_id: str) -> Optional[str]:
+        return DETAIL_API_RATING_URL.format(product_id=product_id)
+
+    def parsear_specs_api(self, data) -> str:
+        return parsear_specs_api(data)
+
+    def parsear_rating_api(self, data) -> Optional[str]:
+        return parsear_rating_api(data)
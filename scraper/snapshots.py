@@ -0,0 +1,180 @@
+# scraper/snapshots.py
+# Caché local de HTML/JSON crudo (gzip, direccionado por contenido) para --snapshots / --replay.
+import json
+import gzip
+import hashlib
+import threading
+import os
+import os.path as osp
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from scraper import config
+from scraper.config import LOGGER
+
+
+# =========================
+# SNAPSHOTS (HTML/JSON crudo comprimido, direccionado por contenido)
+# =========================
+# Formato preferido: MHTML de CDP (Page.captureSnapshot). Incluye DOM, CSS y recursos, y Chrome lo
+# abre sin ejecutar scripts, así el replay ve el mismo innerText/.text que la corrida en vivo.
+#
+# Respaldo (drivers sin CDP): DOM ya renderizado sin <script>, con <base href> a la URL original y
+# las reglas CSS legibles copiadas en un <style> (el replay no tiene red para bajar las hojas).
+JS_HTML_SNAPSHOT = """
+const doc = document.documentElement.cloneNode(true);
+doc.querySelectorAll('script, noscript, iframe, link[rel=preload], link[rel=prefetch]').forEach(e => e.remove());
+let head = doc.querySelector('head');
+if (!head) { head = document.createElement('head'); doc.prepend(head); }
+const base = document.createElement('base');
+base.setAttribute('href', document.baseURI);
+head.prepend(base);
+const reglas = [];
+for (const hoja of document.styleSheets) {
+    try { for (const r of hoja.cssRules) reglas.push(r.cssText); } catch (e) { /* hoja de otro origen */ }
+}
+const estilo = document.createElement('style');
+estilo.textContent = reglas.join('\\n');
+head.appendChild(estilo);
+return '<!DOCTYPE html>' + doc.outerHTML;
+"""
+
+EXTENSION_FORMATO = {"mhtml": ".mhtml", "html": ".html"}
+
+
+class SnapshotStore:
+    """
+    Guarda contenidos crudos como objetos gzip nombrados por su sha256 (objetos/ab/<sha>.gz),
+    así dos páginas idénticas ocupan un solo archivo. Si el contenido no es estable entre capturas
+    (MHTML: fecha y boundary aleatorio) se pasa 'huella' y el sha se calcula sobre ella. Cada guardado agrega una línea a index.jsonl
+    con tipo ("listado", "api", "ficha"), url, sha, fecha y metadatos (clave, página, corrida, formato...).
+    Las entradas "crawl" no tienen objeto: marcan el fin del crawl de una categoría (completa, alcance).
+    """
+
+    def __init__(self, raiz: str):
+        self.raiz = raiz
+        self.indice_path = osp.join(raiz, "index.jsonl")
+        os.makedirs(osp.join(raiz, "objetos"), exist_ok=True)
+        self._lock = threading.Lock()
+        # (tipo, url, corrida|None) -> entrada más reciente
+        self._ultimos: Optional[Dict[Tuple[str, str, Optional[str]], dict]] = None
+
+    def _ruta(self, sha: str) -> str:
+        return osp.join(self.raiz, "objetos", sha[:2], sha + ".gz")
+
+    def guardar(self, tipo: str, url: str, contenido: str, huella: Optional[str] = None, **meta) -> str:
+        datos = contenido.encode("utf-8")
+        sha = hashlib.sha256(huella.encode("utf-8") if huella is not None else datos).hexdigest()
+        ruta = self._ruta(sha)
+        with self._lock:
+            if not osp.exists(ruta):
+                os.makedirs(osp.dirname(ruta), exist_ok=True)
+                tmp = f"{ruta}.{os.getpid()}.tmp"
+                with gzip.open(tmp, "wb", compresslevel=6) as f:
+                    f.write(datos)
+                os.replace(tmp, ruta)
+            self._agregar_entrada({"tipo": tipo, "url": url, "sha": sha, "fecha": datetime.now().isoformat(), **meta})
+        return sha
+
+    def registrar(self, tipo: str, url: str, **meta) -> None:
+        """Agrega al índice una entrada sin contenido (p.ej. la marca de fin de crawl)."""
+        with self._lock:
+            self._agregar_entrada({"tipo": tipo, "url": url, "fecha": datetime.now().isoformat(), **meta})
+
+    def _agregar_entrada(self, entrada: dict) -> None:
+        with open(self.indice_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        if self._ultimos is not None:
+            self._indexar(entrada)
+
+    def _indexar(self, e: dict) -> None:
+        self._ultimos[(e["tipo"], e["url"], None)] = e
+        self._ultimos[(e["tipo"], e["url"], e.get("corrida"))] = e
+
+    def leer(self, sha: str) -> str:
+        with gzip.open(self._ruta(sha), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def indice(self) -> List[dict]:
+        entradas: List[dict] = []
+        try:
+            with open(self.indice_path, "r", encoding="utf-8") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if linea:
+                        entradas.append(json.loads(linea))
+        except FileNotFoundError:
+            pass
+        return entradas
+
+    def ultima_entrada(self, tipo: str, url: str, corrida: Optional[str] = None) -> Optional[dict]:
+        """Entrada más reciente de (tipo, url); con 'corrida', solo de esa corrida."""
+        with self._lock:
+            if self._ultimos is None:
+                self._ultimos = {}
+                for e in self.indice():
+                    self._indexar(e)
+            return self._ultimos.get((tipo, url, corrida))
+
+    def ultimo_sha(self, tipo: str, url: str, corrida: Optional[str] = None) -> Optional[str]:
+        e = self.ultima_entrada(tipo, url, corrida)
+        return e["sha"] if e else None
+
+    def ultimo(self, tipo: str, url: str, corrida: Optional[str] = None) -> Optional[str]:
+        """Contenido del snapshot más reciente de (tipo, url) (de 'corrida' si se indica), o None."""
+        sha = self.ultimo_sha(tipo, url, corrida)
+        return self.leer(sha) if sha else None
+
+    def archivo_local(self, sha: str, formato: str = "html") -> str:
+        """Descomprime el objeto a un archivo temporal (una vez) para abrirlo con file:// en el navegador."""
+        ruta = osp.join(self.raiz, "_html", sha + EXTENSION_FORMATO.get(formato, ".html"))
+        if not osp.exists(ruta):
+            os.makedirs(osp.dirname(ruta), exist_ok=True)
+            tmp = f"{ruta}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.leer(sha))
+            os.replace(tmp, ruta)
+        return ruta
+
+
+_SNAPSHOTS: Optional[SnapshotStore] = None
+
+
+def get_snapshots() -> Optional[SnapshotStore]:
+    """Store activo si SNAPSHOT_DIR está configurado (None = no se guardan snapshots)."""
+    global _SNAPSHOTS
+    if config.SNAPSHOT_DIR and (_SNAPSHOTS is None or _SNAPSHOTS.raiz != config.SNAPSHOT_DIR):
+        _SNAPSHOTS = SnapshotStore(config.SNAPSHOT_DIR)
+    return _SNAPSHOTS if config.SNAPSHOT_DIR else None
+
+
+def snapshot_html(driver, tipo: str, url: Optional[str] = None, **meta) -> None:
+    """Guarda el DOM actual del driver en el store (si está activo y no estamos en replay)."""
+    store = get_snapshots()
+    if store is None or config.REPLAY_MODE:
+        return
+    try:
+        dom = driver.execute_script(JS_HTML_SNAPSHOT)
+        try:
+            contenido = driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+            # El MHTML trae Date y un MultipartBoundary distintos en cada captura: se deduplica por el DOM
+            formato, huella = "mhtml", "mhtml\n" + dom
+        except Exception:
+            contenido, formato, huella = dom, "html", None
+        store.guardar(
+            tipo, url or driver.current_url, contenido, huella=huella,
+            corrida=config.CORRIDA_ID, formato=formato, **meta
+        )
+    except Exception as e:
+        LOGGER.debug(f"No se pudo guardar snapshot {tipo}: {e}")
+
+
+def marcar_crawl(clave: str, url: str, completa: bool, alcance: dict) -> None:
+    """Marca en el índice el fin del crawl de una categoría: si terminó y con qué alcance (lo usa --replay)."""
+    store = get_snapshots()
+    if store is None or config.REPLAY_MODE:
+        return
+    try:
+        store.registrar("crawl", url, clave=clave, corrida=config.CORRIDA_ID, completa=bool(completa), alcance=alcance)
+    except Exception as e:
+        LOGGER.debug(f"No se pudo marcar el crawl de {clave}: {e}")
@@ -0,0 +1,72 @@
+# scraper/stats.py
+# Subcomando 'stats': consultas rápidas sobre las salidas usando los resúmenes.
+import json
+import glob
+import os.path as osp
+from typing import List, Optional
+
+from scraper import config
+from scraper.categorias import resolver_categoria_por_nombre
+from scraper.parsers import slugify
+from scraper.salidas import cargar_resumen
+from scraper.sitios import sitios_disponibles
+
+
+def _fmt_precio(v: Optional[float]) -> str:
+    return "N/A" if v is None else f"$ {int(round(v)):,}".replace(",", ".")
+
+
+def imprimir_stats(resumen: dict, por: Optional[str] = None, top: int = 10) -> None:
+    precio = resumen["precio"]
+    q = precio["cuantiles"]
+    status = ", ".join(f"{k}: {v['n']} ({v['ratio']:.0%})" for k, v in resumen["extraction_status"].items())
+    print(f"📄 {resumen['archivo']}  —  {resumen['total']} productos")
+    print(f"   Estado     : {status or 'N/A'}")
+    print(f"   Precio     : min {_fmt_precio(precio['min'])} | p25 {_fmt_precio(q.get('p25'))} | "
+          f"mediana {_fmt_precio(q.get('p50'))} | p75 {_fmt_precio(q.get('p75'))} | max {_fmt_precio(precio['max'])}")
+    if por == "marca":
+        print("   Marca                 n    mediana         min             max")
+        for marca, m in list(resumen["marcas"].items())[:top]:
+            pm = m["precio"]
+            print(f"   {marca[:20]:<20} {m['n']:>4}    {_fmt_precio(pm['cuantiles'].get('p50')):<15} "
+                  f"{_fmt_precio(pm['min']):<15} {_fmt_precio(pm['max'])}")
+    elif por == "tamano":
+        for tam, n in list(resumen["tamanos"].items())[:top]:
+            print(f"   {tam:<10} {n:>5}")
+    print()
+
+
+def ejecutar_stats(argv: List[str]) -> None:
+    """Subcomando 'stats': responde desde los resúmenes de data/ sin cargar los JSON completos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="scrape_falabella_all.py stats",
+        description="Estadísticas rápidas de las salidas (usa *.summary.json; si están desactualizados recorre el JSONL)."
+    )
+    parser.add_argument("--sitio", choices=sitios_disponibles(), default=None, help="Sitio cuyas salidas consultar (por defecto el principal, en data/).")
+    parser.add_argument("--category", type=str, default=None, help="Solo esta categoría (clave de las categorías del sitio).")
+    parser.add_argument("--sufijo", type=str, default="formatted", help="Tipo de salida: formatted o refresh.")
+    parser.add_argument("--por", choices=["marca", "tamano"], default=None, help="Desglose por marca o por tamaño.")
+    parser.add_argument("--top", type=int, default=10, help="Filas del desglose.")
+    parser.add_argument("--json", action="store_true", help="Imprimir los resúmenes en JSON.")
+    parser.add_argument("--recalcular", action="store_true", help="Ignorar los resúmenes y recorrer los JSONL.")
+    args = parser.parse_args(argv)
+
+    if args.sitio:
+        config.usar_sitio(args.sitio)
+    if args.category:
+        nombre_match, _ = resolver_categoria_por_nombre(args.category)
+        rutas = [osp.join(config.OUT_DIR, f"{slugify(nombre_match or args.category)}_{args.sufijo}.jsonl")]
+    else:
+        rutas = sorted(glob.glob(osp.join(config.OUT_DIR, f"*_{args.sufijo}.jsonl")))
+    rutas = [r for r in rutas if osp.exists(r)]
+    if not rutas:
+        raise SystemExit(f"❌ No hay archivos *_{args.sufijo}.jsonl en {config.OUT_DIR}.")
+
+    resumenes = [cargar_resumen(r, recalcular=args.recalcular) for r in rutas]
+    if args.json:
+        print(json.dumps(resumenes if len(resumenes) > 1 else resumenes[0], ensure_ascii=False, indent=4))
+        return
+    for r in resumenes:
+        imprimir_stats(r, por=args.por, top=args.top)